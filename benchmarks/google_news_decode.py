@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: offline Google News article-ID decoding vs. the network path.
+
+    python benchmarks/google_news_decode.py
+    python benchmarks/google_news_decode.py --network https://news.google.com/rss/articles/...
+"""
+import argparse
+import asyncio
+import base64
+import time
+
+from crawl4ai_news_fetcher import RedirectResolver
+from crawl4ai_news_fetcher.google_news import decode_article_id
+
+
+def make_article_url(target: str) -> str:
+    """Build an old-style ``CBMi...`` article URL embedding ``target``."""
+    encoded = target.encode()
+    length = len(encoded)
+    if length < 0x80:
+        varint = bytes([length])
+    else:
+        varint = bytes([length & 0x7F | 0x80, length >> 7])
+    message = b"\x08\x13\x22" + varint + encoded + b"\xd2\x01\x00"
+    article_id = base64.urlsafe_b64encode(message).decode().rstrip("=")
+    return f"https://news.google.com/rss/articles/{article_id}?oc=5"
+
+
+def bench_offline(iterations: int):
+    urls = [
+        make_article_url(f"https://www.example-news.com/world/2024/story-{i}.html")
+        for i in range(100)
+    ]
+    # Newer opaque IDs must miss the fast path quickly
+    opaque = "https://news.google.com/rss/articles/CBMiqwFBVV95cUxNMTRqdUZpNl9hQldX?oc=5"
+
+    for label, sample in (("old-style ID", urls), ("opaque ID (miss)", [opaque])):
+        rounds = max(1, iterations // len(sample))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for url in sample:
+                decode_article_id(url)
+        elapsed = time.perf_counter() - start
+        per_url = elapsed / (rounds * len(sample)) * 1e6
+        print(f"offline  {label:<18} {per_url:8.2f} µs/URL")
+
+
+async def bench_network(urls: list[str]):
+    async with RedirectResolver(verbose=False, cache=False) as resolver:
+        for url in urls:
+            start = time.perf_counter()
+            resolved = await resolver._resolve_google_news(url)
+            elapsed = time.perf_counter() - start
+            method = "offline" if decode_article_id(url) else "network"
+            print(f"{method:<8} {elapsed * 1e6:12.0f} µs/URL  -> {resolved}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument(
+        "--network",
+        nargs="*",
+        default=[],
+        metavar="URL",
+        help="also time the full resolver path for these Google News URLs",
+    )
+    args = parser.parse_args()
+
+    bench_offline(args.iterations)
+    if args.network:
+        asyncio.run(bench_network(args.network))
+
+
+if __name__ == "__main__":
+    main()
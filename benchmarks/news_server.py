@@ -0,0 +1,204 @@
+"""
+Local stand-in for the services the resolver and fetcher talk to.
+
+One threaded HTTP server answers for every host, dispatching on the Host
+header, so benchmark clients keep the real hostnames (bit.ly, t.co,
+news.google.com, ...) and only their transport is pointed at this server:
+
+    bit.ly, t.co, ...   /chain/<n>/<id>  301 chain of n hops to the article
+                        /meta/<id>       meta-refresh page
+                        /js/<id>         window.location redirect page
+                        /canon/<id>      page carrying only a canonical link
+    news.google.com     /rss/articles/<id>  article page with c-wiz[data-p]
+                        /_/DotsSplashUi/data/batchexecute
+    anything else       /article/<id>    article with a canonical link
+
+    python benchmarks/news_server.py --port 8765 --latency 20
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+SHORTENERS = ("bit.ly", "t.co", "tinyurl.com", "ow.ly", "buff.ly")
+PUBLISHER = "www.example-news.com"
+
+WORDS = (
+    "government market climate election report minister city council energy "
+    "budget court health research company workers prices season analysts "
+    "officials plan growth policy"
+).split()
+
+
+def article_url(article_id: str) -> str:
+    return f"https://{PUBLISHER}/article/{article_id}"
+
+
+def article_html(article_id: str, words: int = 400) -> str:
+    rng = random.Random(article_id)
+    paragraphs = []
+    for _ in range(max(1, words // 50)):
+        paragraphs.append("<p>" + " ".join(rng.choices(WORDS, k=50)) + ".</p>")
+    return (
+        "<html><head>"
+        f"<title>Story {article_id}</title>"
+        f'<link rel="canonical" href="{article_url(article_id)}">'
+        f'<meta property="og:url" content="{article_url(article_id)}">'
+        "</head><body><nav>Home | World | Business</nav>"
+        f"<article><h1>Story {article_id}</h1>{''.join(paragraphs)}</article>"
+        "<footer>Example News</footer></body></html>"
+    )
+
+
+def padding(size: int) -> str:
+    """Filler standing in for the scripts and markup of real pages."""
+    return "<div>" + "x" * size + "</div>"
+
+
+class NewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "NewsServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length") or 0)
+        self._handle(body=self.rfile.read(length))
+
+    def _handle(self, head: bool = False, body: bytes = b""):
+        self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        host = (self.headers.get("host") or "").split(":")[0].lower()
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if host == "news.google.com":
+            self._google_news(parts, body, head)
+        elif host in SHORTENERS:
+            self._shortener(parts, head)
+        elif parts[:1] == ["article"] and len(parts) == 2:
+            self._send(200, article_html(parts[1], self.server.article_words), head)
+        else:
+            self._send(404, "not found", head)
+
+    def _shortener(self, parts: list[str], head: bool):
+        kind, rest = (parts[0], parts[1:]) if parts else ("", [])
+        if kind == "chain" and len(rest) == 2:
+            hops, article_id = int(rest[0]), rest[1]
+            if hops > 1:
+                host = SHORTENERS[hops % len(SHORTENERS)]
+                location = f"https://{host}/chain/{hops - 1}/{article_id}"
+            else:
+                location = article_url(article_id)
+            self._send(301, "", head, {"Location": location})
+        elif kind == "meta" and len(rest) == 1:
+            html = (
+                '<html><head><meta http-equiv="refresh" '
+                f'content="0; url={article_url(rest[0])}"></head>'
+                f"<body>{padding(self.server.page_padding)}</body></html>"
+            )
+            self._send(200, html, head)
+        elif kind == "js" and len(rest) == 1:
+            html = (
+                "<html><head><script>"
+                f'window.location.replace("{article_url(rest[0])}")'
+                f"</script></head><body>{padding(self.server.page_padding)}"
+                "</body></html>"
+            )
+            self._send(200, html, head)
+        elif kind == "canon" and len(rest) == 1:
+            html = (
+                f'<html><head><link rel="canonical" href="{article_url(rest[0])}">'
+                f"</head><body>{padding(self.server.page_padding)}</body></html>"
+            )
+            self._send(200, html, head)
+        else:
+            self._send(404, "not found", head)
+
+    def _google_news(self, parts: list[str], body: bytes, head: bool):
+        if parts[:2] == ["rss", "articles"] and len(parts) == 3:
+            # Decoded by the resolver as ["garturlreq", id, 0, 0, 0, 0, ts, sig]
+            # and trimmed to ["garturlreq", id, ts, sig] for batchexecute.
+            data_p = f'%.@."{parts[2]}",0,0,0,0,1700000000,"sig"]'
+            html = (
+                "<html><head><title>Google News</title></head><body>"
+                f"<c-wiz data-p='{data_p}'></c-wiz>"
+                f"{padding(self.server.page_padding)}</body></html>"
+            )
+            self._send(200, html, head)
+        elif parts[-1:] == ["batchexecute"]:
+            form = parse_qs(body.decode())
+            calls = json.loads(form["f.req"][0])[0]
+            entries = []
+            for rpc_id, payload, _, index in calls:
+                article_id = json.loads(payload)[1]
+                result = json.dumps(["garturlres", article_url(article_id), 1])
+                entries.append(["wrb.fr", rpc_id, result, None, None, None, index])
+            self._send(200, ")]}'\n\n" + json.dumps(entries), head)
+        else:
+            self._send(404, "not found", head)
+
+    def _send(self, status: int, text: str, head: bool, headers: dict = None):
+        data = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+
+class NewsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        latency: float = 0.0,
+        page_padding: int = 64 * 1024,
+        article_words: int = 400,
+    ):
+        super().__init__(address, NewsHandler)
+        self.latency = latency
+        self.page_padding = page_padding
+        self.article_words = article_words
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="ms per request")
+    args = parser.parse_args()
+
+    server = NewsServer(("127.0.0.1", args.port), latency=args.latency / 1000)
+    print(f"serving on http://127.0.0.1:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
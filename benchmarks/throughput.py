@@ -0,0 +1,286 @@
+"""
+Offline throughput benchmark for RedirectResolver (and optionally
+NewsContentFetcher) against the local stand-in server in news_server.py.
+
+    python benchmarks/throughput.py --urls 2000 --latency 20
+    python benchmarks/throughput.py --fetch --output results/run.json
+
+Reports URLs/s, p50/p95/p99 latency per URL kind and per resolution method,
+requests and bytes per URL and peak RSS, and writes them as JSON so runs
+can be compared over time. The Chromium fallback is disabled: every URL in
+the corpus is resolvable over plain HTTP.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from crawl4ai_news_fetcher import RedirectResolver, ResolutionCache
+from crawl4ai_news_fetcher import redirect_resolver
+from google_news_decode import make_article_url
+from news_server import SHORTENERS, NewsServer, article_url
+
+# kind -> relative weight in the generated corpus
+URL_MIX = {
+    "chain": 30,
+    "meta": 10,
+    "js": 10,
+    "canon": 10,
+    "gnews": 20,
+    "gnews_offline": 10,
+    "direct": 10,
+}
+
+
+def build_corpus(count: int, seed: int = 0) -> list[tuple[str, str, str]]:
+    """``(kind, url, expected)`` triples with unique article IDs."""
+    rng = random.Random(seed)
+    kinds = rng.choices(list(URL_MIX), weights=list(URL_MIX.values()), k=count)
+    corpus = []
+    for i, kind in enumerate(kinds):
+        article_id = f"{kind}-{i}"
+        expected = article_url(article_id)
+        host = SHORTENERS[i % len(SHORTENERS)]
+        if kind == "chain":
+            url = f"https://{host}/chain/{rng.randint(1, 3)}/{article_id}"
+        elif kind in ("meta", "js", "canon"):
+            url = f"https://{host}/{kind}/{article_id}"
+        elif kind == "gnews":
+            url = f"https://news.google.com/rss/articles/{article_id}?oc=5"
+        elif kind == "gnews_offline":
+            url = make_article_url(expected)
+        else:
+            url = expected
+        corpus.append((kind, url, expected))
+    return corpus
+
+
+class LocalTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the local server, keeping the original Host."""
+
+    def __init__(self, port: int, **kwargs):
+        self.port = port
+        self._inner = httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # A new request object: the client reports the original URL on the
+        # response, so redirect logic still sees the real hosts.
+        local = httpx.Request(
+            request.method,
+            request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port),
+            headers=request.headers,
+            stream=request.stream,
+            extensions=request.extensions,
+        )
+        return await self._inner.handle_async_request(local)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+def _serve(conn, latency: float, page_padding: int):
+    server = NewsServer(latency=latency, page_padding=page_padding)
+    conn.send(server.port)
+    server.serve_forever()
+
+
+def start_server(latency: float, page_padding: int) -> tuple:
+    """Run the stand-in server in its own process, out of the measured RSS."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=_serve, args=(child, latency, page_padding), daemon=True
+    )
+    process.start()
+    return process, parent.recv()
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+async def bench_resolve(args, port: int, corpus: list) -> dict:
+    method_latencies: dict[str, list[float]] = defaultdict(list)
+
+    def on_sample(kind, name, labels, value):
+        if name == "method_seconds":
+            method_latencies[labels["method"]].append(value)
+
+    resolver = RedirectResolver(
+        verbose=False,
+        cache=ResolutionCache() if args.cache else False,
+        transport=LocalTransport(port, limits=httpx.Limits(max_connections=100)),
+    )
+    resolver.metrics.add_hook(on_sample)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    kind_latencies: dict[str, list[float]] = defaultdict(list)
+    latencies: list[float] = []
+    wrong: list[dict] = []
+
+    async def one(kind: str, url: str, expected: str):
+        async with semaphore:
+            started = time.perf_counter()
+            resolved = await resolver.resolve(url)
+            elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        kind_latencies[kind].append(elapsed)
+        if resolved != expected:
+            wrong.append({"kind": kind, "url": url, "resolved": resolved})
+
+    async with resolver:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(*entry) for entry in corpus))
+        elapsed = time.perf_counter() - started
+
+    stats = resolver.stats
+    return {
+        "urls": len(corpus),
+        "elapsed_s": round(elapsed, 3),
+        "urls_per_s": round(len(corpus) / elapsed, 1),
+        "correct": len(corpus) - len(wrong),
+        "wrong_sample": wrong[:5],
+        "latency": percentiles(latencies),
+        "latency_by_kind": {
+            k: percentiles(v) for k, v in sorted(kind_latencies.items())
+        },
+        "latency_by_method": {
+            k: percentiles(v) for k, v in sorted(method_latencies.items())
+        },
+        "requests_per_url": round(stats["requests"] / len(corpus), 3),
+        "bytes_per_url": round(stats["bytes_downloaded"] / len(corpus), 1),
+        "resolver_stats": stats,
+        "counters": resolver.metrics.snapshot()["counters"],
+    }
+
+
+async def bench_fetch(args, port: int, corpus: list) -> dict:
+    """End to end through NewsContentFetcher with HTTP-only extraction."""
+    from crawl4ai_news_fetcher import NewsContentFetcher
+
+    resolver = RedirectResolver(verbose=False, transport=LocalTransport(port))
+    fetcher = NewsContentFetcher(
+        resolver=resolver,
+        extraction_mode="http",
+        resolve_concurrency=args.concurrency,
+        fields=("markdown_filtered", "final_url"),
+    )
+    ok = 0
+    async with resolver, fetcher:
+        started = time.perf_counter()
+        async for _, result in fetcher.fetch_many(url for _, url, _ in corpus):
+            ok += result is not None
+        elapsed = time.perf_counter() - started
+
+    return {
+        "urls": len(corpus),
+        "ok": ok,
+        "elapsed_s": round(elapsed, 3),
+        "urls_per_s": round(len(corpus) / elapsed, 1),
+        "pipeline": fetcher.pipeline_stats(),
+        "extraction_stats": fetcher.extraction_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=10.0, help="ms per request")
+    parser.add_argument("--page-padding", type=int, default=64 * 1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="enable the LRU cache")
+    parser.add_argument(
+        "--fetch", action="store_true", help="also run the content fetcher"
+    )
+    parser.add_argument("--output", help="JSON report path (default: timestamped)")
+    args = parser.parse_args()
+
+    # Every corpus URL resolves over HTTP; never launch a browser here.
+    redirect_resolver.PLAYWRIGHT_AVAILABLE = False
+
+    process, port = start_server(args.latency / 1000, args.page_padding)
+    try:
+        corpus = build_corpus(args.urls, args.seed)
+        report = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "config": vars(args),
+            "resolve": asyncio.run(bench_resolve(args, port, corpus)),
+        }
+        if args.fetch:
+            report["fetch"] = asyncio.run(bench_fetch(args, port, corpus))
+        report["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        process.terminate()
+
+    resolve = report["resolve"]
+    print(
+        f"{resolve['urls']} URLs in {resolve['elapsed_s']}s "
+        f"({resolve['urls_per_s']} URLs/s), {resolve['correct']} correct"
+    )
+    print(
+        f"{resolve['requests_per_url']} requests/URL, "
+        f"{resolve['bytes_per_url']:.0f} bytes/URL, "
+        f"peak RSS {report['peak_rss_mb']} MB"
+    )
+    for method, lat in resolve["latency_by_method"].items():
+        print(
+            f"  {method:<10} n={lat['count']:<6} p50={lat['p50_ms']}ms "
+            f"p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms"
+        )
+    if "fetch" in report:
+        fetch = report["fetch"]
+        print(f"fetch: {fetch['ok']}/{fetch['urls']} ok, {fetch['urls_per_s']} URLs/s")
+
+    output = Path(
+        args.output
+        or Path(__file__).parent / "results" / time.strftime("%Y%m%d-%H%M%S.json")
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
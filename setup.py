@@ -29,12 +29,17 @@ setup(
         "setuptools>=45.0",  # Added setuptools
         "crawl4ai>=0.5.0",
         "httpx>=0.24.0",
-        "beautifulsoup4>=4.12.0",
         "lxml>=4.9.0",
         "cssselect>=1.2.0",
         "playwright>=1.40.0",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "zstd": [
+            "zstandard>=0.21.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-asyncio>=0.21.0",
@@ -47,6 +52,7 @@ setup(
        entry_points={
         'console_scripts': [
             'crawl4ai-install-browsers=crawl4ai_news_fetcher.install:install_browsers',
+            'crawl4ai-news-fetch=crawl4ai_news_fetcher.cli:main',
         ],
     },
 )
\ No newline at end of file
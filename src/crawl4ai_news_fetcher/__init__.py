@@ -2,8 +2,51 @@
 Crawl4AI News Fetcher - A specialized news content fetcher with redirect resolution.
 """
 
+from importlib import import_module
+
 from .redirect_resolver import RedirectResolver
-from .content_fetcher import NewsContentFetcher
+from .browser_pool import BrowserPool
+from .cache import ResolutionCache
+from .dedup import DuplicateDetector, SimHashIndex
+from .metrics import Metrics
+from .result_store import ResultStore
+from .results import FetchResult, JsonlWriter
+from .scheduler import HostScheduler
+from .singleflight import SingleFlight
+from .strategy import StrategyStats
+from .urls import RedirectRegistry, normalize_url
 
 __version__ = "0.1.0"
-__all__ = ["RedirectResolver", "NewsContentFetcher"]
\ No newline at end of file
+__all__ = [
+    "RedirectResolver",
+    "NewsContentFetcher",
+    "ResolutionCache",
+    "BrowserPool",
+    "HostScheduler",
+    "Metrics",
+    "ResultStore",
+    "DuplicateDetector",
+    "SimHashIndex",
+    "ShardedRunner",
+    "FetchResult",
+    "JsonlWriter",
+    "SingleFlight",
+    "StrategyStats",
+    "RedirectRegistry",
+    "normalize_url",
+]
+
+# These pull in crawl4ai; loading them on first use keeps the resolver and
+# the other modules importable (and testable) without it.
+_LAZY = {
+    "NewsContentFetcher": ".content_fetcher",
+    "ShardedRunner": ".runner",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class BrowserPool:
+    """
+    A Chromium browser kept open for the pool's lifetime that hands out
+    isolated pages (one fresh context each), at most ``max_pages`` at a time.
+
+    The browser is launched lazily on first use, or an already running
+    browser (e.g. the one owned by crawl4ai's ``AsyncWebCrawler``) can be
+    attached so no extra process is spawned at all.
+    """
+
+    def __init__(self, max_pages: int = 4, headless: bool = True):
+        self.max_pages = max_pages
+        self.headless = headless
+        self._semaphore = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._owns_browser = False
+
+    def attach(self, browser):
+        """Use an externally managed browser; it is never closed by the pool."""
+        self._browser = browser
+        self._owns_browser = False
+
+    def detach(self):
+        """Forget an attached browser, e.g. before its owner shuts it down."""
+        if not self._owns_browser:
+            self._browser = None
+
+    async def _get_browser(self):
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    # Imported here so resolving without a browser (and the
+                    # HTTP-only modules) work where playwright is absent
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless
+                )
+                self._owns_browser = True
+            return self._browser
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """Yield a new page in its own context, closed again on exit."""
+        async with self._semaphore:
+            browser = await self._get_browser()
+            context = await browser.new_context(**context_options)
+            try:
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+    async def aclose(self):
+        async with self._lock:
+            if self._browser is not None and self._owns_browser:
+                await self._browser.close()
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
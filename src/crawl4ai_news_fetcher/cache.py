@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResolutionCache:
+    """
+    Two-tier cache for redirect resolution results.
+
+    The memory tier is an LRU bounded by ``max_size``; the optional disk tier
+    is a SQLite file at ``path`` so results survive restarts. Failed
+    resolutions are cached too (negative caching) with their own, usually
+    shorter, ``negative_ttl``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 6 * 3600,
+        negative_ttl: float = 600,
+        path: str | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+
+        self._memory: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.disk_hits = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resolutions ("
+                "url TEXT PRIMARY KEY, final_url TEXT, expires REAL NOT NULL)"
+            )
+            self.purge_expired()
+
+    def get(self, url: str) -> tuple[bool, str | None]:
+        """
+        Look up ``url``. Returns ``(hit, final_url)``; on a negative hit
+        ``final_url`` is None, meaning the URL failed to resolve recently.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(url)
+                    return self._hit(entry[0])
+                del self._memory[url]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT final_url, expires FROM resolutions WHERE url = ?",
+                    (url,),
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self.disk_hits += 1
+                    self._remember(url, row[0], row[1])
+                    return self._hit(row[0])
+
+            self.misses += 1
+            return False, None
+
+    def set(self, url: str, final_url: str, ttl: float | None = None):
+        """Cache a successful resolution."""
+        self._store(url, final_url, ttl if ttl is not None else self.ttl)
+
+    def set_failed(self, url: str, ttl: float | None = None):
+        """Cache a failed resolution so it is not retried until it expires."""
+        self._store(url, None, ttl if ttl is not None else self.negative_ttl)
+
+    def purge_expired(self):
+        """Drop expired entries from both tiers."""
+        now = time.time()
+        with self._lock:
+            for url in [u for u, (_, exp) in self._memory.items() if exp <= now]:
+                del self._memory[url]
+            if self._db is not None:
+                self._db.execute("DELETE FROM resolutions WHERE expires <= ?", (now,))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM resolutions")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._memory),
+        }
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _hit(self, final_url: str | None) -> tuple[bool, str | None]:
+        self.hits += 1
+        if final_url is None:
+            self.negative_hits += 1
+        return True, final_url
+
+    def _store(self, url: str, final_url: str | None, ttl: float):
+        expires = time.time() + ttl
+        with self._lock:
+            self._remember(url, final_url, expires)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO resolutions (url, final_url, expires) "
+                    "VALUES (?, ?, ?)",
+                    (url, final_url, expires),
+                )
+                self._db.commit()
+
+    def _remember(self, url: str, final_url: str | None, expires: float):
+        self._memory[url] = (final_url, expires)
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
@@ -0,0 +1,133 @@
+"""
+Batch fetch news URLs into an NDJSON file.
+
+    crawl4ai-news-fetch urls.txt --workers 4 --output results.jsonl.gz
+    cat urls.txt | crawl4ai-news-fetch - --query "interest rates" --ordered
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+from typing import AsyncIterator, Iterator
+
+from .content_fetcher import EXTRACTION_MODES, NewsContentFetcher
+from .results import RESULT_FIELDS, JsonlWriter
+from .runner import LOG_FORMAT, ShardedRunner
+
+
+def read_urls(path: str) -> Iterator[str]:
+    """Non-empty, non-comment lines of ``path`` (``-`` for stdin), lazily."""
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="crawl4ai-news-fetch", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("input", help="file with one URL per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON output (.gz ok)")
+    parser.add_argument("-q", "--query", help="BM25 query for markdown_filtered")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="fetcher processes"
+    )
+    parser.add_argument(
+        "--ordered", action="store_true", help="write results in input order"
+    )
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument(
+        "--extraction-mode", choices=EXTRACTION_MODES, default="browser"
+    )
+    parser.add_argument(
+        "--fields",
+        help=f"comma-separated result fields (default: {','.join(RESULT_FIELDS)})",
+    )
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    log_level = (logging.WARNING, logging.INFO, logging.DEBUG)[min(args.verbose, 2)]
+    logging.basicConfig(level=log_level, format=LOG_FORMAT, stream=sys.stderr)
+
+    fetcher_kwargs = {
+        "concurrency": args.concurrency,
+        "extraction_mode": args.extraction_mode,
+    }
+    if args.fields:
+        fetcher_kwargs["fields"] = tuple(f.strip() for f in args.fields.split(","))
+
+    urls = read_urls(args.input)
+    with JsonlWriter(args.output) as writer:
+        # A single unordered job runs in-process; anything else goes through
+        # the runner, whose merge step also restores input order.
+        if args.workers > 1 or args.ordered:
+            runner = ShardedRunner(
+                workers=args.workers,
+                fetcher_kwargs=fetcher_kwargs,
+                ordered=args.ordered,
+                log_level=log_level,
+            )
+            for url, result in runner.run(urls, args.query):
+                writer.write(url, result)
+        else:
+            asyncio.run(_run_local(urls, args.query, fetcher_kwargs, writer))
+
+    logging.getLogger(__name__).info("wrote %d results", writer.count)
+    return 0
+
+
+async def _run_local(
+    urls: Iterator[str], query: str | None, fetcher_kwargs: dict, writer: JsonlWriter
+):
+    async with NewsContentFetcher(**fetcher_kwargs) as fetcher:
+        await writer.write_all(fetcher.fetch_many(_threaded(urls), query))
+
+
+async def _threaded(urls: Iterator[str], maxsize: int = 1000) -> AsyncIterator[str]:
+    """
+    Iterate ``urls`` in a daemon thread, like the runner's feeder, so a slow
+    input such as a stdin pipe never blocks the event loop (and every fetch
+    in flight with it). At most ``maxsize`` URLs are read ahead.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+    done = object()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def feed():
+        try:
+            for url in urls:
+                put(url)
+            item = done
+        except Exception as e:
+            item = e
+        try:
+            put(item)
+        except RuntimeError:
+            # The loop is gone: nobody is reading any more
+            pass
+
+    threading.Thread(target=feed, daemon=True).start()
+    while True:
+        item = await queue.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+if __name__ == "__main__":
+    sys.exit(main())
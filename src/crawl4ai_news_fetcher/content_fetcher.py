@@ -1,19 +1,86 @@
 import asyncio
 import json
+import logging
 import os
+import re
+from collections import OrderedDict
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+import httpx
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
-from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
 from crawl4ai.async_configs import BrowserConfig
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 from crawl4ai.content_filter_strategy import BM25ContentFilter
 
+from .dedup import DuplicateDetector
+from .metrics import Metrics
+from .pipeline import HostReadyQueue, StageStats
 from .redirect_resolver import RedirectResolver
+from .result_store import ResultStore, content_hash
+from .results import RESULT_FIELDS, FetchResult, ResultShaper
+from .scheduler import HostScheduler
+from .singleflight import SingleFlight
+from .urls import normalize_url
+
+DEFAULT_EXCLUDED_SELECTOR = (
+    "nav, footer, header, aside, "
+    ".navbar, .footer, .header, .sidebar, "
+    ".ads, #navbar, #footer, "
+    "[role='navigation'], [role='banner'], [role='contentinfo']"
+)
+
+EXTRACTION_MODES = ("browser", "http")
+
+DEDUP_MODES = ("flag", "skip")
+
+JS_GATE = re.compile(
+    r"(enable|turn on) javascript|javascript (is )?(required|disabled)"
+    r"|requires javascript",
+    re.IGNORECASE,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class NewsContentFetcher:
-    def __init__(self, concurrency: int = 5, timeout: int = 30):
+    def __init__(
+        self,
+        concurrency: int = 5,
+        timeout: int = 30,
+        resolver: RedirectResolver | None = None,
+        resolve_concurrency: int = 50,
+        queue_size: int = 100,
+        per_host_concurrency: int = 4,
+        per_host_rate: float | None = None,
+        excluded_selector: str = DEFAULT_EXCLUDED_SELECTOR,
+        bm25_threshold: float = 0.7,
+        max_cached_configs: int = 128,
+        extraction_mode: str = "browser",
+        static_concurrency: int = 20,
+        min_static_words: int = 150,
+        store: ResultStore | None = None,
+        fields: tuple[str, ...] | None = None,
+        html_codec: str | None = None,
+        compact: bool = False,
+        metrics: Metrics | None = None,
+        dedup: DuplicateDetector | None = None,
+        dedup_mode: str = "flag",
+    ):
+        # `concurrency` bounds browser crawls, `resolve_concurrency` bounds
+        # the much cheaper redirect resolutions feeding them.
+        self.concurrency = concurrency
         self.semaphore = asyncio.Semaphore(concurrency)
+        self.resolve_semaphore = asyncio.Semaphore(resolve_concurrency)
+        self.queue_size = queue_size
+        # Counters and latency histograms for both stages; an owned resolver
+        # records into the same instance.
+        if metrics is None:
+            metrics = resolver.metrics if resolver is not None else Metrics()
+        self.metrics = metrics
+        self.resolve_stats = StageStats(metrics=metrics, name="resolve")
+        self.crawl_stats = StageStats(metrics=metrics, name="crawl")
+        self._queues: set[HostReadyQueue] = set()
         self.browser_cfg = BrowserConfig(
             headless=True,
             user_agent=(
@@ -24,60 +91,534 @@ class NewsContentFetcher:
             browser_type="chromium",
         )
         self.crawler: AsyncWebCrawler | None = None
-        self.resolver = RedirectResolver(timeout=timeout)
+        # One per-host budget covers both the resolver's HTTP calls and the
+        # crawler's page loads, keyed on the host actually being contacted.
+        # An injected resolver brings its own scheduler, which is then shared
+        # (and `per_host_concurrency`/`per_host_rate` are not used).
+        if resolver is not None:
+            self.scheduler = resolver.scheduler
+        else:
+            self.scheduler = HostScheduler(
+                per_host_concurrency=per_host_concurrency,
+                per_host_rate=per_host_rate,
+            )
+        # An injected resolver (and its HTTP pool) belongs to the caller.
+        self._owns_resolver = resolver is None
+        self.resolver = resolver or RedirectResolver(
+            timeout=timeout, scheduler=self.scheduler, metrics=metrics
+        )
+        self._inflight = SingleFlight()
+
+        # Crawl configs are reused per query instead of rebuilt per fetch
+        self.excluded_selector = excluded_selector
+        self.bm25_threshold = bm25_threshold
+        self.max_cached_configs = max_cached_configs
+        self._scraping_strategy = LXMLWebScrapingStrategy()
+        self._run_configs: OrderedDict[tuple, CrawlerRunConfig] = OrderedDict()
+
+        # "browser" renders every page in Chromium; "http" extracts from the
+        # raw HTML first and only falls back to the browser when needed.
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"extraction_mode must be one of {EXTRACTION_MODES}, "
+                f"got {extraction_mode!r}"
+            )
+        self.extraction_mode = extraction_mode
+        self.static_semaphore = asyncio.Semaphore(static_concurrency)
+        self.min_static_words = min_static_words
+        # Optional local result store for conditional refetches
+        self.store = store
+        self._workers = concurrency
+        if extraction_mode == "http":
+            self._workers = concurrency + static_concurrency
+        # Near-duplicate detection: "flag" returns duplicates with
+        # `duplicate_of` set, "skip" also drops their content and, when the
+        # HTML lead already matches, never renders them.
+        if dedup_mode not in DEDUP_MODES:
+            raise ValueError(
+                f"dedup_mode must be one of {DEDUP_MODES}, got {dedup_mode!r}"
+            )
+        self.dedup = dedup
+        self.dedup_mode = dedup_mode
+        # What callers get back: the selected fields as a dict (all of them
+        # by default), or a compact FetchResult with optionally compressed HTML
+        self.shaper = ResultShaper(
+            fields=fields, html_codec=html_codec, compact=compact
+        )
 
     async def __aenter__(self):
         self.crawler = AsyncWebCrawler(config=self.browser_cfg)
         await self.crawler.__aenter__()
+        await self.resolver.__aenter__()
+
+        # Let the resolver's Chromium fallback open pages in the crawler's
+        # browser instead of launching a second one, when it is reachable.
+        strategy = getattr(self.crawler, "crawler_strategy", None)
+        manager = getattr(strategy, "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        if browser is not None:
+            self.resolver.browser_pool.attach(browser)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self.crawler:
-            await self.crawler.__aexit__(exc_type, exc, tb)
+        self.resolver.browser_pool.detach()
+        try:
+            if self.crawler:
+                await self.crawler.__aexit__(exc_type, exc, tb)
+        finally:
+            if self.dedup is not None:
+                self.dedup.save()
+            if self._owns_resolver:
+                await self.resolver.aclose()
+
+    async def fetch(
+        self, url: str, user_query: str | None = None
+    ) -> dict | FetchResult | None:
+        # Resolution and crawling are limited separately so cheap redirect
+        # lookups never hold one of the scarce browser slots.
+        async with self.resolve_semaphore:
+            final_url = await self._resolve(url)
+        return await self._crawl_shared(final_url, user_query)
 
-    async def fetch(self, url: str, user_query: str | None = None) -> dict | None:
-        async with self.semaphore:
+    async def fetch_many(
+        self,
+        urls: Iterable[str] | AsyncIterable[str],
+        query: str | None = None,
+    ) -> AsyncIterator[tuple[str, dict | FetchResult | None]]:
+        """
+        Fetch many URLs, yielding ``(url, result)`` pairs as each crawl
+        completes (``result`` is None on failure).
+
+        Runs as a two-stage pipeline: up to ``resolve_concurrency`` URLs are
+        resolved at once and handed over a queue of ``queue_size`` to
+        ``concurrency`` crawl workers (plus ``static_concurrency`` in "http"
+        extraction mode). Workers take resolved URLs round-robin by host,
+        skipping hosts that are backed off or at their per-host limit.
+        ``urls`` may be a (possibly endless) iterable or async iterable; it
+        is consumed lazily and every stage blocks when the next one is full,
+        so memory stays flat.
+        """
+        resolved = HostReadyQueue(self.scheduler, maxsize=self.queue_size)
+        output: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = self._workers
+        done = object()
+
+        async def resolve_one(url: str):
+            try:
+                final_url = await self._resolve(url)
+                await resolved.put((url, final_url))
+            finally:
+                self.resolve_semaphore.release()
+
+        async def resolve_stage():
+            tasks: set[asyncio.Task] = set()
             try:
-                final_url = await self.resolver.resolve(url)
+                async for url in _aiter(urls):
+                    await self.resolve_semaphore.acquire()
+                    task = asyncio.create_task(resolve_one(url))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                raise
+            except Exception:
+                # The input iterable failed: finish the URLs already taken
+                await asyncio.gather(*tasks)
+                await resolved.close()
+                raise
+            await resolved.close()
+
+        async def crawl_worker():
+            cancelled = False
+            try:
+                while True:
+                    item = await resolved.get()
+                    if item is None:
+                        break
+                    url, final_url = item
+                    try:
+                        result = await self._crawl_shared(final_url, query)
+                    except Exception as e:
+                        # One bad page must not take the worker (and with it
+                        # the whole batch) down
+                        logger.warning("Crawl of %s failed: %s", final_url, e)
+                        self.metrics.inc(
+                            "failures", stage="crawl", reason=type(e).__name__
+                        )
+                        result = None
+                    finally:
+                        await resolved.task_done(item)
+                    await output.put((url, result))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # A cancelled pipeline has no reader left to unblock the put
+                if not cancelled:
+                    await output.put(done)
+
+        self._queues.add(resolved)
+        stages = [asyncio.create_task(resolve_stage())]
+        stages += [asyncio.create_task(crawl_worker()) for _ in range(workers)]
+        try:
+            finished = 0
+            while finished < workers:
+                item = await output.get()
+                if item is done:
+                    finished += 1
+                    continue
+                yield item
+            # Surface a failure of the input iterable
+            await stages[0]
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            self._queues.discard(resolved)
+
+    @property
+    def extraction_stats(self) -> dict:
+        return {
+            mode: self.metrics.counter("extractions", mode=mode)
+            for mode in ("static", "browser_fallback")
+        }
+
+    def pipeline_stats(self) -> dict:
+        """Per-stage in-flight counts and latencies plus hand-off queue depth."""
+        return {
+            "resolve": self.resolve_stats.snapshot(),
+            "crawl": self.crawl_stats.snapshot(),
+            "queue_depth": sum(q.qsize() for q in self._queues),
+            "queue_size": self.queue_size,
+        }
+
+    async def _resolve(self, url: str) -> str:
+        with self.resolve_stats.track():
+            try:
+                return await self.resolver.resolve(url)
             except Exception as e:
-                print(f"[Resolver] Error resolving {url}: {e}")
-                final_url = url
-
-            print(f"🌐 Fetching content from: {final_url} | query={user_query}")
-
-            crawl_config = CrawlerRunConfig(
-                deep_crawl_strategy=BFSDeepCrawlStrategy(
-                    max_depth=0, include_external=False
-                ),
-                scraping_strategy=LXMLWebScrapingStrategy(),
-                wait_until="domcontentloaded",
-                exclude_external_links=True,
-                excluded_selector=(
-                    "nav, footer, header, aside, "
-                    ".navbar, .footer, .header, .sidebar, "
-                    ".ads, #navbar, #footer, "
-                    "[role='navigation'], [role='banner'], [role='contentinfo']"
-                ),
-                markdown_generator=DefaultMarkdownGenerator(
-                    content_filter=BM25ContentFilter(
-                        user_query=user_query,
-                        bm25_threshold=0.7,
+                logger.warning("Error resolving %s: %s", url, e)
+                return url
+
+    async def _crawl_shared(
+        self, final_url: str, user_query: str | None
+    ) -> dict | FetchResult | None:
+        # Different links to one article (and duplicates within a batch)
+        # share a single crawl keyed on the resolved URL.
+        key = (normalize_url(final_url), user_query)
+        result = await self._inflight.do(
+            key, lambda: self._crawl(final_url, user_query)
+        )
+        return self.shaper.shape(result) if result else None
+
+    def _run_config(self, user_query: str | None) -> CrawlerRunConfig:
+        """
+        The crawl config for ``user_query``, built once and reused: scraping
+        strategy, markdown generator and BM25 filter are stateless per call,
+        so only the query (and the construction-time options) select one.
+        """
+        key = (user_query, self.excluded_selector, self.bm25_threshold)
+        config = self._run_configs.get(key)
+        if config is not None:
+            self._run_configs.move_to_end(key)
+            return config
+
+        config = CrawlerRunConfig(
+            scraping_strategy=self._scraping_strategy,
+            wait_until="domcontentloaded",
+            exclude_external_links=True,
+            excluded_selector=self.excluded_selector,
+            markdown_generator=DefaultMarkdownGenerator(
+                content_filter=BM25ContentFilter(
+                    user_query=user_query,
+                    bm25_threshold=self.bm25_threshold,
+                )
+            ),
+        )
+        self._run_configs[key] = config
+        if len(self._run_configs) > self.max_cached_configs:
+            self._run_configs.popitem(last=False)
+        return config
+
+    @staticmethod
+    def _to_record(result, final_url: str) -> dict | None:
+        if not result.markdown:
+            return None
+        return {
+            "markdown_raw": result.markdown.raw_markdown or "",
+            "markdown_filtered": result.markdown.fit_markdown or "",
+            "html": result.html or "",
+            "final_url": str(final_url),
+        }
+
+    async def _crawl(self, final_url: str, user_query: str | None) -> dict | None:
+        # Host slot first, so pages queued behind a busy or throttled host
+        # do not hold browser slots that other hosts could use.
+        async with self.scheduler.slot(final_url):
+            with self.crawl_stats.track():
+                resp = None
+                if self.store is not None:
+                    entry = self.store.get(final_url, user_query)
+                    if entry is not None:
+                        record, resp = await self._revalidate(
+                            final_url, user_query, entry
+                        )
+                        if record is not None:
+                            self.metrics.inc("extractions", mode="store")
+                            return record
+
+                record = None
+                headers: dict = {}
+                lead_fp = original = None
+                if self.dedup is not None:
+                    if resp is not None or self.extraction_mode == "http":
+                        # http mode extracts from the full page, so the lead
+                        # check fetches it once for both. So is any response
+                        # from revalidation reused: refetching a 4xx/5xx
+                        # right away would only return the same error.
+                        async with self.static_semaphore:
+                            if resp is None:
+                                resp = await self._fetch_raw(final_url)
+                        if resp is not None and resp.status_code == 200:
+                            lead_fp = self.dedup.lead_fingerprint(resp.text)
+                    else:
+                        # The browser renders the page anyway: read only
+                        # as much as the title and lead paragraphs take
+                        async with self.static_semaphore:
+                            lead_fp = await self._fetch_lead(final_url)
+                    original = self.dedup.match_lead(final_url, lead_fp)
+                    if original is not None:
+                        self.metrics.inc("duplicates", stage="lead")
+                        if self.dedup_mode == "skip":
+                            return self._duplicate_record(final_url, original)
+
+                if self.extraction_mode == "http":
+                    async with self.static_semaphore:
+                        if resp is None:
+                            resp = await self._fetch_raw(final_url)
+                        if resp is not None:
+                            headers = resp.headers
+                            record = await self._extract_static(
+                                final_url, user_query, resp
+                            )
+                    if record is not None:
+                        self.metrics.inc("extractions", mode="static")
+                    else:
+                        self.metrics.inc("extractions", mode="browser_fallback")
+
+                if record is None:
+                    async with self.semaphore:
+                        record, headers = await self._crawl_page(
+                            final_url, user_query
+                        )
+                    if record is not None and self.extraction_mode == "browser":
+                        self.metrics.inc("extractions", mode="browser")
+
+                if record is not None and self.dedup is not None:
+                    record = self._check_duplicate(
+                        final_url, record, lead_fp, original
                     )
-                ),
+                    if "duplicate_of" in record and self.dedup_mode == "skip":
+                        return record
+
+                if record is not None and self.store is not None:
+                    self.store.put(
+                        final_url,
+                        user_query,
+                        record,
+                        etag=headers.get("etag"),
+                        last_modified=headers.get("last-modified"),
+                        body_hash=(
+                            content_hash(resp.content)
+                            if resp is not None and resp.status_code == 200
+                            else None
+                        ),
+                    )
+                return record
+
+    def _check_duplicate(
+        self,
+        final_url: str,
+        record: dict,
+        lead_fp: int | None,
+        original: str | None,
+    ) -> dict:
+        """
+        Flag ``record`` as a copy of an earlier article (``original`` when the
+        lead already matched), or index it as a new one.
+        """
+        content_original, content_fp = self.dedup.match_content(
+            final_url, record["markdown_raw"]
+        )
+        original = original or content_original
+        if original is None:
+            self.dedup.add(final_url, content_fp, lead_fp)
+            return record
+        if content_original is not None:
+            self.metrics.inc("duplicates", stage="content")
+        if self.dedup_mode == "skip":
+            return self._duplicate_record(final_url, original)
+        return {**record, "duplicate_of": original}
+
+    @staticmethod
+    def _duplicate_record(final_url: str, original: str) -> dict:
+        """Content-free result standing in for a skipped duplicate."""
+        return {
+            "markdown_raw": "",
+            "markdown_filtered": "",
+            "html": "",
+            "final_url": str(final_url),
+            "duplicate_of": original,
+        }
+
+    async def _revalidate(
+        self, final_url: str, user_query: str | None, entry: dict
+    ) -> tuple[dict | None, httpx.Response | None]:
+        """
+        Check a stored result against the origin with a conditional request.
+        Returns the stored record when the page is unchanged (304, or the
+        same body hash), otherwise ``(None, response)`` so the response is
+        reused for extraction instead of fetched again.
+        """
+        # Without validators this is a plain GET; its body hash is stored
+        # with the new extraction so the next refetch can compare against it.
+        headers = ResultStore.conditional_headers(entry)
+        async with self.static_semaphore:
+            resp = await self._fetch_raw(final_url, headers=headers)
+        if resp is None:
+            return None, None
+
+        body_hash = content_hash(resp.content) if resp.status_code == 200 else None
+        if resp.status_code == 304:
+            self.store.not_modified += 1
+        elif body_hash is not None and body_hash == entry.get("content_hash"):
+            self.store.unchanged += 1
+        else:
+            return None, resp
+
+        self.store.revalidated(
+            final_url,
+            user_query,
+            etag=resp.headers.get("etag"),
+            last_modified=resp.headers.get("last-modified"),
+            body_hash=body_hash,
+        )
+        record = {k: entry[k] for k in RESULT_FIELDS}
+        return record, None
+
+    async def _fetch_raw(
+        self, final_url: str, headers: dict | None = None
+    ) -> httpx.Response | None:
+        """GET the page over the pooled HTTP client (host slot already held)."""
+        try:
+            resp = await self.resolver.client.get(final_url, headers=headers)
+        except Exception as e:
+            logger.warning("HTTP fetch failed for %s: %s", final_url, e)
+            self.metrics.inc("failures", stage="fetch", reason=type(e).__name__)
+            return None
+        self.scheduler.report(
+            final_url, resp.status_code, resp.headers.get("retry-after")
+        )
+        self.metrics.inc("page_requests")
+        self.metrics.inc("page_bytes_downloaded", len(resp.content))
+        return resp
+
+    async def _fetch_lead(self, final_url: str) -> int | None:
+        """
+        Lead fingerprint of the page, streamed and cut off as soon as the
+        dedup lead is complete (host slot already held).
+        """
+        try:
+            async with self.resolver.client.stream("GET", final_url) as resp:
+                self.scheduler.report(
+                    final_url, resp.status_code, resp.headers.get("retry-after")
+                )
+                self.metrics.inc("page_requests")
+                if resp.status_code != 200:
+                    return None
+                scanner = self.dedup.lead_scanner(resp.charset_encoding)
+                async for chunk in resp.aiter_bytes():
+                    self.metrics.inc("page_bytes_downloaded", len(chunk))
+                    if scanner.feed(chunk):
+                        break
+        except Exception as e:
+            logger.warning("HTTP fetch failed for %s: %s", final_url, e)
+            self.metrics.inc("failures", stage="fetch", reason=type(e).__name__)
+            return None
+        scanner.close()
+        return self.dedup.fingerprint_lead(scanner.text())
+
+    async def _extract_static(
+        self, final_url: str, user_query: str | None, resp: httpx.Response
+    ) -> dict | None:
+        """
+        Run the scraping, markdown and BM25 pipeline on a raw HTTP response,
+        without a browser page. Returns None when the result looks empty or
+        JavaScript-gated.
+        """
+        content_type = resp.headers.get("content-type", "")
+        if resp.status_code >= 400 or "html" not in content_type:
+            return None
+        html = resp.text
+
+        try:
+            results = await self.crawler.arun(
+                "raw:" + html, config=self._run_config(user_query)
             )
+            for result in results:
+                record = self._to_record(result, final_url)
+                if record and not self._looks_incomplete(record, html):
+                    return record
+        except Exception as e:
+            logger.warning("Static extraction failed for %s: %s", final_url, e)
+            self.metrics.inc("failures", stage="static", reason=type(e).__name__)
+        return None
+
+    def _looks_incomplete(self, record: dict, html: str) -> bool:
+        """Heuristic for pages that need a browser to render their content."""
+        words = len(record["markdown_raw"].split())
+        if words < self.min_static_words:
+            return True
+        # A "please enable JavaScript" notice only matters on thin pages;
+        # plenty of fully rendered articles carry one for embeds.
+        return words < 3 * self.min_static_words and bool(JS_GATE.search(html))
+
+    async def _crawl_page(
+        self, final_url: str, user_query: str | None
+    ) -> tuple[dict | None, dict]:
+        """Render the page in the browser; returns the record and headers."""
+        logger.debug("Fetching content from: %s | query=%s", final_url, user_query)
+
+        crawl_config = self._run_config(user_query)
+
+        try:
+            results = await self.crawler.arun(final_url, config=crawl_config)
+            for result in results:
+                headers = getattr(result, "response_headers", None) or {}
+                self.scheduler.report(
+                    final_url,
+                    getattr(result, "status_code", None),
+                    headers.get("retry-after"),
+                )
+                record = self._to_record(result, final_url)
+                if record:
+                    return record, headers
+            logger.warning("No content extracted for %s", final_url)
+            self.metrics.inc("failures", stage="browser", reason="no_content")
+        except Exception as e:
+            logger.warning("Error fetching %s (query=%s): %s", final_url, user_query, e)
+            self.metrics.inc("failures", stage="browser", reason=type(e).__name__)
+
+        return None, {}
 
-            try:
-                results = await self.crawler.arun(final_url, config=crawl_config)
-                for result in results:
-                    if result.markdown:
-                        return {
-                            "markdown_raw": result.markdown.raw_markdown or "",
-                            "markdown_filtered": result.markdown.fit_markdown or "",
-                            "html": result.html or "",
-                            "final_url": str(final_url),
-                        }
-                print(f"⚠️ No content extracted for {final_url}")
-            except Exception as e:
-                print(f"❌ Error fetching {user_query},{final_url}: {e}")
 
-            return None
\ No newline at end of file
+async def _aiter(items: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,319 @@
+import hashlib
+import json
+import os
+import re
+
+from lxml import etree
+
+WORD = re.compile(r"\w+", re.UNICODE)
+# "Headline | Site Name", "Headline - Site Name", ...
+TITLE_SEPARATOR = re.compile(r"\s[|\-\u2013\u2014:]\s")
+
+
+def simhash(text: str, bits: int = 64, shingle: int = 3) -> int:
+    """
+    SimHash fingerprint of ``text`` over lower-cased word shingles. Texts
+    sharing most of their shingles get fingerprints a few bits apart.
+    """
+    words = WORD.findall(text.lower())
+    if len(words) < shingle:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [
+            " ".join(words[i : i + shingle]) for i in range(len(words) - shingle + 1)
+        ]
+
+    weights = [0] * bits
+    for feature in shingles:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=bits // 8)
+        value = int.from_bytes(digest.digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def lead_text(html: str, words: int = 60) -> str:
+    """
+    Title plus the first ``words`` words of paragraph text: enough to tell
+    syndicated copies of a story apart from other articles, at the cost of
+    one lxml parse instead of a browser render. Publisher suffixes such as
+    "| Site Name" are dropped from the title, since they differ per copy.
+    """
+    scanner = LeadScanner(words, max_bytes=None)
+    scanner.feed(html)
+    scanner.close()
+    return scanner.text()
+
+
+class LeadScanner:
+    """
+    Incremental ``lead_text``: fed raw response chunks, it collects the
+    title and lead paragraphs as lxml's pull parser emits them. ``feed``
+    returns True once ``words`` paragraph words have been read, or after
+    ``max_bytes``, so the rest of the page need not be downloaded.
+    """
+
+    def __init__(
+        self,
+        words: int = 60,
+        max_bytes: int | None = 256 * 1024,
+        encoding: str | None = None,
+    ):
+        self.words = words
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.done = False
+        self._title = ""
+        self._og_title = ""
+        self._lead: list[str] = []
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), encoding=encoding
+        )
+
+    def feed(self, chunk: bytes | str) -> bool:
+        """Consume a chunk; True means the lead is complete."""
+        if self.done:
+            return True
+        self.bytes_read += len(chunk)
+        self._parser.feed(chunk)
+        self._drain()
+        if len(self._lead) >= self.words or (
+            self.max_bytes is not None and self.bytes_read >= self.max_bytes
+        ):
+            self.done = True
+        return self.done
+
+    def close(self):
+        if not self.done:
+            try:
+                self._parser.close()
+            except etree.LxmlError:
+                pass
+            self._drain()
+        self.done = True
+
+    def text(self) -> str:
+        headline = max(TITLE_SEPARATOR.split(self._og_title or self._title), key=len)
+        return " ".join([headline.strip()] + self._lead[: self.words])
+
+    def _drain(self):
+        for event, el in self._parser.read_events():
+            tag = el.tag
+            if not isinstance(tag, str) or len(self._lead) >= self.words:
+                continue
+            tag = tag.lower()
+            if event == "start":
+                if tag == "meta" and el.get("property") == "og:title":
+                    self._og_title = self._og_title or el.get("content") or ""
+            elif tag == "title":
+                self._title = self._title or el.text or ""
+            elif tag == "p":
+                self._lead += WORD.findall("".join(el.itertext()))
+                # Finished paragraphs are not needed again; keep memory flat
+                el.clear()
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup over SimHash fingerprints.
+
+    Fingerprints are split into ``bands`` bands, each indexed in its own hash
+    table. Two fingerprints within ``max_distance`` bits of each other agree
+    on at least one band whenever ``bands > max_distance``, so a query only
+    compares against the few entries sharing a band instead of all of them.
+    """
+
+    def __init__(self, bits: int = 64, bands: int = 4, max_distance: int = 3):
+        if bands <= max_distance:
+            raise ValueError("bands must exceed max_distance to find all matches")
+        if bits % bands:
+            raise ValueError("bits must be a multiple of bands")
+        self.bits = bits
+        self.bands = bands
+        self.max_distance = max_distance
+        self._band_bits = bits // bands
+        self._mask = (1 << self._band_bits) - 1
+        self._tables: list[dict[int, list[int]]] = [{} for _ in range(bands)]
+        self._entries: list[tuple[int, str]] = []
+
+    def add(self, fingerprint: int, key: str):
+        index = len(self._entries)
+        self._entries.append((fingerprint, key))
+        for table, band in zip(self._tables, self._split(fingerprint)):
+            table.setdefault(band, []).append(index)
+
+    def query(self, fingerprint: int) -> tuple[str, int] | None:
+        """The closest indexed key within ``max_distance`` and its distance."""
+        seen: set[int] = set()
+        best: tuple[str, int] | None = None
+        for table, band in zip(self._tables, self._split(fingerprint)):
+            for index in table.get(band, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                other, key = self._entries[index]
+                distance = hamming(fingerprint, other)
+                if distance <= self.max_distance and (
+                    best is None or distance < best[1]
+                ):
+                    best = (key, distance)
+        return best
+
+    def to_dict(self) -> dict:
+        return {
+            "bits": self.bits,
+            "bands": self.bands,
+            "max_distance": self.max_distance,
+            "entries": self._entries,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SimHashIndex":
+        index = cls(data["bits"], data["bands"], data["max_distance"])
+        for fingerprint, key in data["entries"]:
+            index.add(fingerprint, key)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _split(self, fingerprint: int) -> list[int]:
+        return [
+            fingerprint >> (band * self._band_bits) & self._mask
+            for band in range(self.bands)
+        ]
+
+
+class DuplicateDetector:
+    """
+    Finds syndicated copies of already-fetched articles.
+
+    Two SimHash indexes are kept: one over the title and lead paragraphs of
+    the raw HTML, checked from a cheap HTTP pre-fetch before any browser
+    work, and one over the extracted ``markdown_raw``, which catches copies
+    whose markup differs. Leads shorter than ``min_lead_words`` are not
+    trusted; a streamed lead (``lead_scanner``) stops after
+    ``max_lead_bytes``. With ``path`` set, both indexes are loaded from and saved to a
+    JSON file, so detection carries across runs. Markdown shorter than
+    ``min_content_words`` (empty pages, cookie walls, boilerplate) is neither
+    matched nor indexed, since such pages all look alike.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_distance: int = 3,
+        bands: int = 4,
+        lead_words: int = 60,
+        min_lead_words: int = 25,
+        min_content_words: int = 50,
+        max_lead_bytes: int = 256 * 1024,
+    ):
+        self.path = path
+        self.lead_words = lead_words
+        self.min_lead_words = min_lead_words
+        self.min_content_words = min_content_words
+        self.max_lead_bytes = max_lead_bytes
+        self.lead_index = SimHashIndex(bands=bands, max_distance=max_distance)
+        self.content_index = SimHashIndex(bands=bands, max_distance=max_distance)
+        self._urls: set[str] = set()
+        self.lead_hits = 0
+        self.content_hits = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def lead_fingerprint(self, html: str) -> int | None:
+        return self.fingerprint_lead(lead_text(html, self.lead_words))
+
+    def lead_scanner(self, encoding: str | None = None) -> LeadScanner:
+        """A scanner reading just enough of a page for ``fingerprint_lead``."""
+        return LeadScanner(self.lead_words, self.max_lead_bytes, encoding)
+
+    def fingerprint_lead(self, lead: str) -> int | None:
+        if len(lead.split()) < self.min_lead_words:
+            return None
+        return simhash(lead)
+
+    def match_lead(self, url: str, fingerprint: int | None) -> str | None:
+        """URL of another article with the same title and lead, if any."""
+        if fingerprint is None:
+            return None
+        match = self.lead_index.query(fingerprint)
+        if match is None or match[0] == url:
+            return None
+        self.lead_hits += 1
+        return match[0]
+
+    def match_content(
+        self, url: str, markdown: str
+    ) -> tuple[str | None, int | None]:
+        """
+        ``(original_url, fingerprint)`` for the extracted markdown; both are
+        None when it is too short to fingerprint.
+        """
+        if len(WORD.findall(markdown or "")) < self.min_content_words:
+            return None, None
+        fingerprint = simhash(markdown)
+        match = self.content_index.query(fingerprint)
+        if match is None or match[0] == url:
+            return None, fingerprint
+        self.content_hits += 1
+        return match[0], fingerprint
+
+    def add(
+        self,
+        url: str,
+        content_fingerprint: int | None,
+        lead_fingerprint: int | None,
+    ):
+        # The same page fetched again (say, for another query) is not new,
+        # and a page without usable content is no reference for others
+        if url in self._urls or content_fingerprint is None:
+            return
+        self._urls.add(url)
+        self.content_index.add(content_fingerprint, url)
+        if lead_fingerprint is not None:
+            self.lead_index.add(lead_fingerprint, url)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "articles": len(self.content_index),
+            "lead_hits": self.lead_hits,
+            "content_hits": self.content_hits,
+        }
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != self.VERSION:
+            return
+        self.lead_index = SimHashIndex.from_dict(data["lead"])
+        self.content_index = SimHashIndex.from_dict(data["content"])
+        self._urls = {key for _, key in data["content"]["entries"]}
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "lead": self.lead_index.to_dict(),
+                    "content": self.content_index.to_dict(),
+                },
+                fh,
+            )
+        os.replace(tmp, self.path)
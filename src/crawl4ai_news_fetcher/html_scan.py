@@ -0,0 +1,146 @@
+import json
+import re
+from typing import Callable
+from urllib.parse import urljoin
+
+from lxml import etree
+
+JS_REDIRECT = re.compile(r'window\.location(?:\.replace)?\(["\'](.*?)["\']\)')
+REFRESH_URL = re.compile(r"url=([^;]+)", re.I)
+
+
+class HeadScanner:
+    """
+    Incremental redirect-hint scanner fed with raw response chunks.
+
+    Hints are collected as lxml's pull parser emits elements: canonical link,
+    ``og:url``, meta-refresh, ``window.location`` redirects, JSON-LD ``url``,
+    the first outbound link and (for Google News pages) ``c-wiz[data-p]``.
+    ``feed`` returns True once reading further cannot change the answer,
+    which for most pages happens at the end of ``<head>``, or after
+    ``max_bytes`` have been read.
+    """
+
+    # Highest priority first, matching the order of the former soup lookups
+    PRIORITY = ("canonical", "og_url", "refresh", "js", "json_ld", "link")
+    HEAD_HINTS = ("canonical", "og_url", "refresh")
+
+    def __init__(
+        self,
+        base_url: str,
+        is_redirect_domain: Callable[[str], bool],
+        want_data_p: bool = False,
+        max_bytes: int = 256 * 1024,
+        encoding: str | None = None,
+    ):
+        self.base_url = base_url
+        self.is_redirect_domain = is_redirect_domain
+        self.want_data_p = want_data_p
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.hints: dict[str, str] = {}
+        self.data_p: str | None = None
+        self.head_done = False
+        self.done = False
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), encoding=encoding
+        )
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk; True means the scan is complete."""
+        if self.done:
+            return True
+        self.bytes_read += len(chunk)
+        self._parser.feed(chunk)
+        self._drain()
+        if self.bytes_read >= self.max_bytes or self._decisive():
+            self.done = True
+        return self.done
+
+    def close(self):
+        """Finish parsing at end of body (or when the caller stops reading)."""
+        if not self.done:
+            try:
+                self._parser.close()
+            except etree.LxmlError:
+                pass
+            self._drain()
+        self.done = True
+
+    def best(self, kinds: tuple[str, ...] = PRIORITY) -> str | None:
+        """The highest-priority hint among ``kinds``, as an absolute URL."""
+        for kind in kinds:
+            if kind in self.hints:
+                return urljoin(self.base_url, self.hints[kind])
+        return None
+
+    def _decisive(self) -> bool:
+        if self.want_data_p:
+            return self.data_p is not None
+        if "canonical" in self.hints:
+            return True
+        # Head-only hints can no longer be outranked once <head> is over, and
+        # a JS redirect outranks everything that could still follow it.
+        return self.head_done and any(
+            kind in self.hints for kind in ("og_url", "refresh", "js")
+        )
+
+    def _add(self, kind: str, value: str | None):
+        if value and kind not in self.hints:
+            self.hints[kind] = value.strip()
+
+    def _drain(self):
+        for event, el in self._parser.read_events():
+            tag = el.tag
+            if not isinstance(tag, str):
+                continue
+            tag = tag.lower()
+            if event == "start":
+                self._start(tag, el)
+            else:
+                self._end(tag, el)
+
+    def _start(self, tag: str, el):
+        if tag == "link":
+            rel = (el.get("rel") or "").lower().split()
+            if "canonical" in rel:
+                self._add("canonical", el.get("href"))
+        elif tag == "meta":
+            if "og:url" in (el.get("property"), el.get("name")):
+                self._add("og_url", el.get("content"))
+            elif (el.get("http-equiv") or "").lower() == "refresh":
+                m = REFRESH_URL.search(el.get("content") or "")
+                if m:
+                    self._add("refresh", m.group(1).strip("\"' "))
+        elif tag == "body":
+            self.head_done = True
+        elif tag == "a":
+            href = el.get("href") or ""
+            if (
+                "link" not in self.hints
+                and href.startswith("http")
+                and not self.is_redirect_domain(href)
+            ):
+                self._add("link", href)
+        elif tag == "c-wiz" and self.data_p is None:
+            self.data_p = el.get("data-p") or None
+
+    def _end(self, tag: str, el):
+        if tag == "head":
+            self.head_done = True
+        elif tag == "script":
+            text = el.text or ""
+            if (el.get("type") or "").lower() == "application/ld+json":
+                try:
+                    data = json.loads(text or "{}")
+                except ValueError:
+                    data = None
+                if isinstance(data, dict) and isinstance(data.get("url"), str):
+                    self._add("json_ld", data["url"])
+            else:
+                m = JS_REDIRECT.search(text)
+                if m:
+                    self._add("js", m.group(1))
+        # Finished subtrees are not needed again; keep memory flat
+        if tag not in ("html", "head", "body"):
+            el.clear()
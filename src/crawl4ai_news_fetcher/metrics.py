@@ -0,0 +1,174 @@
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Latency buckets in seconds, from cache-speed lookups to browser renders
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# hook(kind, name, labels, value) with kind "counter" or "histogram"
+MetricHook = Callable[[str, str, dict, float], None]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus sense."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound below which a fraction ``q`` of values fall."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """
+    Labelled counters and latency histograms shared by the resolver and the
+    fetcher.
+
+    Recording is a dict update, so it is cheap enough for the hot path.
+    ``add_hook`` forwards every sample to an external system (StatsD,
+    OpenTelemetry, ...), and ``render_prometheus`` produces the text
+    exposition format for a ``/metrics`` endpoint.
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        namespace: str = "news_fetcher",
+    ):
+        self.buckets = buckets
+        self.namespace = namespace
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self._hooks: list[MetricHook] = []
+
+    def add_hook(self, hook: MetricHook):
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: MetricHook):
+        self._hooks.remove(hook)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+        for hook in self._hooks:
+            hook("counter", name, labels, value)
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+        for hook in self._hooks:
+            hook("histogram", name, labels, value)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the duration of the ``with`` block, failed or not."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """Value of one counter, or the sum over all its label sets."""
+        if labels:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+        return sum(v for (n, _), v in self._counters.items() if n == name)
+
+    def histogram(self, name: str, **labels) -> Histogram | None:
+        return self._histograms.get((name, tuple(sorted(labels.items()))))
+
+    def snapshot(self) -> dict:
+        """Counters and histogram summaries as plain, JSON-friendly data."""
+        counters: dict[str, dict] = {}
+        for (name, labels), value in sorted(self._counters.items()):
+            counters.setdefault(name, {})[_label_str(labels)] = value
+        histograms: dict[str, dict] = {}
+        for (name, labels), h in sorted(self._histograms.items()):
+            histograms.setdefault(name, {})[_label_str(labels)] = {
+                "count": h.count,
+                "sum": h.sum,
+                "p50": h.quantile(0.50),
+                "p95": h.quantile(0.95),
+                "p99": h.quantile(0.99),
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        typed: set[str] = set()
+
+        for (name, labels), value in sorted(self._counters.items()):
+            full = f"{self.namespace}_{name}_total"
+            if full not in typed:
+                typed.add(full)
+                lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full}{_prom_labels(labels)} {_num(value)}")
+
+        for (name, labels), h in sorted(self._histograms.items()):
+            full = f"{self.namespace}_{name}"
+            if full not in typed:
+                typed.add(full)
+                lines.append(f"# TYPE {full} histogram")
+            for bound, total in h.cumulative():
+                bucket = labels + (("le", _num(bound)),)
+                lines.append(f"{full}_bucket{_prom_labels(bucket)} {total}")
+            inf = labels + (("le", "+Inf"),)
+            lines.append(f"{full}_bucket{_prom_labels(inf)} {h.count}")
+            lines.append(f"{full}_sum{_prom_labels(labels)} {_num(h.sum)}")
+            lines.append(f"{full}_count{_prom_labels(labels)} {h.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self._counters.clear()
+        self._histograms.clear()
+
+
+def _label_str(labels: tuple) -> str:
+    return ",".join(f"{k}={v}" for k, v in labels)
+
+
+def _prom_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from .metrics import Metrics
+from .scheduler import HostScheduler
+
+
+class StageStats:
+    """
+    In-flight count, throughput and recent latencies of one pipeline stage.
+    With ``metrics`` set, each unit of work is also observed there as
+    ``stage_seconds{stage=name}``.
+    """
+
+    def __init__(
+        self, window: int = 1000, metrics: Metrics | None = None, name: str = ""
+    ):
+        self.metrics = metrics
+        self.name = name
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_time = 0.0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    @contextmanager
+    def track(self):
+        """Time one unit of work; exceptions count it as failed."""
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            # Failure reasons are counted by whoever handles the error
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.total_time += elapsed
+            self._latencies.append(elapsed)
+            if self.metrics is not None:
+                self.metrics.observe("stage_seconds", elapsed, stage=self.name)
+
+    def percentile(self, q: float) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        done = self.completed + self.failed
+        return {
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_s": self.total_time / done if done else 0.0,
+            "p50_s": self.percentile(0.50),
+            "p95_s": self.percentile(0.95),
+        }
+
+
+class HostReadyQueue:
+    """
+    Bounded hand-off queue that parks items in per-host queues and serves
+    hosts round-robin. ``get`` passes over hosts that are backed off, rate
+    limited or already running ``per_host_concurrency`` items, so a
+    throttled host at the head of the input does not stall workers that
+    could be crawling other hosts.
+
+    Items are ``(url, final_url)`` pairs keyed on the host of ``final_url``;
+    callers report each finished item back with ``task_done``. After
+    ``close``, ``get`` returns None once everything has been handed out.
+    """
+
+    def __init__(self, scheduler: HostScheduler, maxsize: int = 0):
+        self.scheduler = scheduler
+        self.maxsize = maxsize
+        self._hosts: OrderedDict[str, deque] = OrderedDict()
+        self._active: dict[str, int] = {}
+        self._size = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+    def qsize(self) -> int:
+        return self._size
+
+    async def put(self, item: tuple[str, str]):
+        async with self._changed:
+            while self.maxsize and self._size >= self.maxsize:
+                await self._changed.wait()
+            host = self.scheduler.host_of(item[1])
+            self._hosts.setdefault(host, deque()).append(item)
+            self._size += 1
+            self._changed.notify_all()
+
+    async def close(self):
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    async def get(self) -> tuple[str, str] | None:
+        async with self._changed:
+            while True:
+                wait = None
+                limit = self.scheduler.per_host_concurrency
+                for host, items in self._hosts.items():
+                    if self._active.get(host, 0) >= limit:
+                        continue
+                    delay = self.scheduler.ready_in(items[0][1])
+                    if delay > 0:
+                        wait = delay if wait is None else min(wait, delay)
+                        continue
+                    item = items.popleft()
+                    # Rotate the host to the back so the others get a turn
+                    del self._hosts[host]
+                    if items:
+                        self._hosts[host] = items
+                    self._active[host] = self._active.get(host, 0) + 1
+                    self._size -= 1
+                    self._changed.notify_all()
+                    return item
+                if self._closed and not self._size:
+                    return None
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def task_done(self, item: tuple[str, str]):
+        host = self.scheduler.host_of(item[1])
+        async with self._changed:
+            self._active[host] -= 1
+            if not self._active[host]:
+                del self._active[host]
+            self._changed.notify_all()
@@ -1,11 +1,21 @@
 import asyncio
 import json
-import re
+import logging
+import time
+from contextlib import asynccontextmanager
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
 import httpx
-from playwright.async_api import async_playwright
+
+from .browser_pool import BrowserPool
+from .cache import ResolutionCache
+from .google_news import GoogleNewsBatchDecoder, decode_article_id
+from .html_scan import HeadScanner
+from .metrics import Metrics
+from .scheduler import HostScheduler
+from .singleflight import SingleFlight
+from .strategy import StrategyStats
+from .urls import RedirectRegistry, normalize_url
 
 # try:
 #     from playwright.async_api import async_playwright
@@ -13,11 +23,101 @@ PLAYWRIGHT_AVAILABLE = True
 # except ImportError:
 #     PLAYWRIGHT_AVAILABLE = False
 
+try:
+    import h2  # noqa: F401
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Share of ``timeout`` each resolution stage may take before the next one
+# gets its turn; override per stage with ``stage_budgets`` (seconds). The
+# whole chain is still bounded by ``timeout``, so later stages get whatever
+# the earlier ones left, up to their own budget.
+STAGE_BUDGET_SHARES = {
+    "GoogleNews": 0.5,
+    "Probe": 0.4,
+    "HTTP": 0.5,
+    "Chromium": 1.0,
+}
+
+# Counters behind the ``stats`` dict kept for existing callers
+STAT_COUNTERS = (
+    "requests",
+    "bytes_downloaded",
+    "requests_saved",
+    "bytes_saved",
+    "gnews_offline_decodes",
+    "scan_early_exits",
+    "probe_hops",
+)
+
 
 class RedirectResolver:
-    def __init__(self, timeout: int = 15, user_agent: str = None, verbose: bool = True):
+    def __init__(
+        self,
+        timeout: int = 15,
+        user_agent: str = None,
+        verbose: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        cache: ResolutionCache | bool = True,
+        max_browser_pages: int = 2,
+        scheduler: HostScheduler | None = None,
+        gnews_batch_size: int = 20,
+        gnews_batch_window: float = 0.05,
+        max_scan_bytes: int = 256 * 1024,
+        registry: RedirectRegistry | None = None,
+        max_hops: int = 10,
+        metrics: Metrics | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        strategy: StrategyStats | bool = True,
+        stage_budgets: dict[str, float] | None = None,
+        hedge_delay: float | None = None,
+        max_hedges: int = 4,
+    ):
         self.timeout = timeout
+        # Progress is logged at INFO when verbose, DEBUG otherwise; either
+        # way nothing is formatted unless the logger is enabled for it.
         self.verbose = verbose
+        self.log_level = logging.INFO if verbose else logging.DEBUG
+        self.metrics = metrics or Metrics()
+        # Which domains/patterns need resolving and which answers are final
+        self.registry = registry or RedirectRegistry()
+        self.max_hops = max_hops
+        # Upper bound on body bytes read while looking for redirect hints
+        self.max_scan_bytes = max_scan_bytes
+        # True -> private in-memory cache, False/None -> no caching
+        if cache is True:
+            cache = ResolutionCache()
+        elif cache is False:
+            cache = None
+        self.cache: ResolutionCache | None = cache
+        # Per-host stage ordering learned from earlier resolutions
+        if strategy is True:
+            strategy = StrategyStats()
+        elif strategy is False:
+            strategy = None
+        self.strategy: StrategyStats | None = strategy
+        # Each stage runs under its own budget, all within one overall timeout
+        self.stage_budgets = {
+            stage: timeout * share for stage, share in STAGE_BUDGET_SHARES.items()
+        }
+        self.stage_budgets.update(stage_budgets or {})
+        # Hedging: start the next stage early when the current one is slow,
+        # with at most `max_hedges` such extra stages running resolver-wide
+        self.hedge_delay = hedge_delay
+        self.max_hedges = max_hedges
+        self._hedges = 0
+        self._inflight = SingleFlight()
+        # Chromium fallback reuses one browser for the resolver's lifetime
+        self.browser_pool = BrowserPool(max_pages=max_browser_pages)
+        # Per-host concurrency, rate limits and 429/503 backoff
+        self.scheduler = scheduler or HostScheduler()
         self.user_agent = user_agent or (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -33,331 +133,495 @@ class RedirectResolver:
             "referer": "https://news.google.com/",
             "origin": "https://news.google.com",
         }
+        self.gnews_decoder = GoogleNewsBatchDecoder(
+            self._post_batchexecute,
+            batch_size=gnews_batch_size,
+            window=gnews_batch_window,
+        )
+
+        if http2 and not H2_AVAILABLE:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using 1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # A custom transport (proxying, local stand-in servers) replaces the
+        # pooled default one; ``limits`` and ``http2`` then do not apply.
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def stats(self) -> dict:
+        """Request/byte accounting, including fetches avoided by reusing a body."""
+        return {name: self.metrics.counter(name) for name in STAT_COUNTERS}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Long-lived pooled HTTP client shared by every resolution step."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": self.user_agent},
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client and the fallback browser."""
+        if self.strategy is not None:
+            self.strategy.save()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.browser_pool.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the pooled client and account for it."""
+        async with self.scheduler.slot(url), self._redirect_limit():
+            resp = await self.client.request(method, url, **kwargs)
+        self._account_hops(resp)
+        self.scheduler.report(
+            str(resp.url), resp.status_code, resp.headers.get("retry-after")
+        )
+        self.metrics.inc("requests")
+        self.metrics.inc("bytes_downloaded", len(resp.content))
+        return resp
+
+    @asynccontextmanager
+    async def _stream(self, url: str, **kwargs):
+        """GET ``url`` without reading the body; the caller reads what it needs."""
+        async with self.scheduler.slot(url), self._redirect_limit():
+            async with self.client.stream("GET", url, **kwargs) as resp:
+                self._account_hops(resp)
+                self._account_headers(resp)
+                yield resp
+
+    def _account_hops(self, resp: httpx.Response):
+        """Count the redirect responses followed on the way to ``resp``."""
+        for hop in resp.history:
+            self.metrics.inc("requests")
+            self.metrics.inc("bytes_downloaded", _header_bytes(hop) + len(hop.content))
+
+    @asynccontextmanager
+    async def _redirect_limit(self):
+        """Count the hops of a chain abandoned at the client's redirect limit."""
+        try:
+            yield
+        except httpx.TooManyRedirects:
+            # No response survives; the limit says how many were received
+            self.metrics.inc("requests", self.client.max_redirects + 1)
+            raise
+
+    async def _scan(self, resp: httpx.Response, scanner: HeadScanner):
+        """Feed the body to ``scanner`` until it has seen enough."""
+        async for chunk in resp.aiter_bytes():
+            self.metrics.inc("bytes_downloaded", len(chunk))
+            if scanner.feed(chunk):
+                self.metrics.inc("scan_early_exits")
+                return
+        scanner.close()
+
+    async def _post_batchexecute(self, data: dict) -> str:
+        r = await self._request(
+            "POST", self.gnews_batch_url, headers=self.gnews_headers, data=data
+        )
+        r.raise_for_status()
+        return r.text
+
+    def _record_saved(self, nbytes: int):
+        """Count a response body reused instead of being fetched again."""
+        self.metrics.inc("requests_saved")
+        self.metrics.inc("bytes_saved", nbytes)
 
-    async def _resolve_internal(self, url: str) -> str:
+    async def __aenter__(self):
+        self.client  # create the pool up front
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _resolve_internal(self, url: str) -> str | None:
         """
         Core internal resolver that tries multiple methods in sequence
-        to find the true final redirect target.
-        """
+        to find the true final redirect target. Returns None if all fail.
 
-        if "news.google.com/rss/articles/" in url:
-            resolved = await self._resolve_google_news(url)
+        Stages run in the order learned for the URL's host (see
+        ``StrategyStats``), each under its ``stage_budgets`` entry, so a slow
+        stage cannot use up the time of the one that would have succeeded.
+        With ``hedge_delay`` set they may also overlap (``_race_stages``).
+        Either way the chain ends ``timeout`` seconds after it started.
+        """
+        host = HostScheduler.host_of(url)
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        stages = self._stages(url)
+        if self.strategy is not None:
+            ordered = self.strategy.order(host, stages)
+            for stage in set(stages) - set(ordered):
+                self.metrics.inc("stage_skips", stage=stage)
+            stages = ordered
+
+        if self.hedge_delay is not None:
+            resolved, method = await self._race_stages(stages, url, host, deadline)
             if resolved:
-                if self.verbose:
-                    print(f"✅ [GoogleNews] Resolved via _resolve_internal: {resolved}")
-                return resolved
-
-        resolved = await self._resolve_http(url)
-        if resolved and not self._is_redirect_domain(resolved):
-            if self.verbose:
-                print(f"✅ [HTTP] Resolved via _resolve_internal: {resolved}")
-            return resolved
-
-        resolved = await self._resolve_html(url)
-        if resolved and not self._is_redirect_domain(resolved):
-            if self.verbose:
-                print(f"✅ [HTML] Resolved via _resolve_internal: {resolved}")
-            return resolved
-
-        # 4️⃣ Try Chromium (Playwright) fallback
+                return self._resolved(url, resolved, method)
+        else:
+            for stage in stages:
+                resolved, method = await self._try_stage(stage, url, host, deadline)
+                if resolved:
+                    return self._resolved(url, resolved, method)
+
+        # None succeeded — the caller falls back to the original URL
+        logger.log(self.log_level, "All resolution methods failed for %s", url)
+        self.metrics.inc("failures", stage="resolve", reason="exhausted")
+        return None
+
+    def _stages(self, url: str) -> list[str]:
+        """Applicable stages for ``url`` in their default order."""
+        stages = []
+        if "news.google.com/rss/articles/" in url:
+            stages.append("GoogleNews")
+        elif self._is_redirect_domain(url):
+            # Shortlinks: walk the Location headers, no bodies downloaded
+            stages.append("Probe")
+        stages.append("HTTP")
         if PLAYWRIGHT_AVAILABLE:
-            resolved = await self._resolve_chromium(url)
+            stages.append("Chromium")
+        return stages
+
+    async def _try_stage(
+        self, stage: str, url: str, host: str, deadline: float
+    ) -> tuple[str | None, str]:
+        """
+        Run one stage under its time budget, cut short at ``deadline`` (loop
+        time). Returns ``(resolved, method)`` with ``resolved`` None unless it
+        left the redirect services.
+        """
+        budget = min(
+            self.stage_budgets[stage], deadline - asyncio.get_running_loop().time()
+        )
+        if budget <= 0:
+            self.metrics.inc("failures", stage=stage, reason="deadline")
+            return None, stage
+        with self._attempt(stage, host) as attempt:
+            try:
+                resolved, method = await asyncio.wait_for(
+                    self._run_stage(stage, url), budget
+                )
+            except asyncio.TimeoutError:
+                logger.log(self.log_level, "%s timed out for %s", stage, url)
+                self.metrics.inc("failures", stage=stage, reason="timeout")
+                return None, stage
             if resolved and not self._is_redirect_domain(resolved):
-                if self.verbose:
-                    print(f"✅ [Chromium] Resolved via _resolve_internal: {resolved}")
-                return resolved
-        else:
-            if self.verbose:
-                print("⚠️ Playwright not available, skipping Chromium resolution")
+                attempt.method = method
+                attempt.result = resolved
+        return attempt.result, attempt.method
 
-        # 5️⃣ None succeeded — return original
-        if self.verbose:
-            print("⚠️ All resolution methods failed, returning original URL")
-        return url
+    async def _race_stages(
+        self, stages: list[str], url: str, host: str, deadline: float
+    ) -> tuple[str | None, str | None]:
+        """
+        Hedged stage chain: when the running stages have not answered within
+        ``hedge_delay``, the next stage starts alongside them, as long as
+        fewer than ``max_hedges`` hedges run resolver-wide. The first
+        acceptable answer wins (the earlier stage on a tie) and the stages
+        still running are cancelled. Without a free hedge slot this is the
+        plain sequential chain.
+        """
+        queue = list(stages)
+        running: dict[asyncio.Task, int] = {}
+        hedges: set[asyncio.Task] = set()
+
+        def start(hedge: bool):
+            index = len(stages) - len(queue)
+            stage = queue.pop(0)
+            task = asyncio.create_task(self._try_stage(stage, url, host, deadline))
+            running[task] = index
+            if hedge:
+                self._hedges += 1
+                hedges.add(task)
+                task.add_done_callback(self._hedge_done)
+                self.metrics.inc("hedges", stage=stage)
+
+        try:
+            start(hedge=False)
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.hedge_delay if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if self._hedges < self.max_hedges:
+                        start(hedge=True)
+                    else:
+                        self.metrics.inc("hedges_capped")
+                    continue
+
+                for task in sorted(done, key=running.get):
+                    del running[task]
+                    try:
+                        resolved, method = task.result()
+                    except Exception:
+                        continue
+                    if resolved:
+                        if task in hedges:
+                            self.metrics.inc("hedge_wins", method=method)
+                        return resolved, method
+                if not running and queue:
+                    start(hedge=False)
+            return None, None
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def _hedge_done(self, task: asyncio.Task):
+        self._hedges -= 1
+
+    async def _run_stage(self, stage: str, url: str) -> tuple[str | None, str]:
+        """Run one stage; returns ``(resolved_url, method)``."""
+        if stage == "GoogleNews":
+            return await self._resolve_google_news(url), stage
+        if stage == "Probe":
+            return await self._resolve_probe(url), stage
+        if stage == "HTTP":
+            resolved, method = await self._resolve_http_html(url)
+            return resolved, method or stage
+        return await self._resolve_chromium(url), stage
+
+    def _attempt(self, stage: str, host: str) -> "_Attempt":
+        return _Attempt(self.metrics, self.strategy, stage, host)
+
+    def _resolved(self, url: str, resolved: str, method: str) -> str:
+        logger.log(self.log_level, "[%s] Resolved %s -> %s", method, url, resolved)
+        return resolved
 
     async def resolve(self, url: str) -> str:
         """Unified redirect resolver with pre-check to avoid unnecessary processing."""
-        if self.verbose:
-            print(f"\n🔍 Resolving: {url}")
-
         # Ensure URL is a string
         url = str(url)
+        logger.log(self.log_level, "Resolving: %s", url)
 
         # ✅ FIRST: Check if redirect resolution is even needed
         if not self._needs_redirect_resolution(url):
-            if self.verbose:
-                print("✅ No redirect resolution needed - returning original URL")
+            self.metrics.inc("resolutions", method="direct")
             return url
 
-        try:
-            # Set overall timeout for the entire resolution process
-            return await asyncio.wait_for(
-                self._resolve_internal(url), timeout=self.timeout
-            )
-        except asyncio.TimeoutError:
-            if self.verbose:
-                print(
-                    f"⏰ Overall timeout after {self.timeout}s, returning original URL"
+        key = normalize_url(url)
+        if self.cache is not None:
+            hit, cached = self.cache.get(key)
+            self.metrics.inc("cache_lookups", result="hit" if hit else "miss")
+            if hit:
+                logger.log(
+                    self.log_level, "Cache hit: %s", cached or "previously failed"
                 )
-            return url
+                return cached or url
+
+        # Concurrent calls for the same URL share one resolution
+        resolved = await self._inflight.do(key, lambda: self._resolve_once(url, key))
+        return resolved or url
+
+    async def _resolve_once(self, url: str, key: str) -> str | None:
+        """Run the resolution chain and cache its outcome."""
+        resolved = None
+        try:
+            # Time limits apply per stage, inside the chain
+            with self.metrics.time("resolve_seconds"):
+                resolved = await self._resolve_internal(url)
         except Exception as e:
-            if self.verbose:
-                print(f"❌ Resolution failed: {e}, returning original URL")
-            return url
+            logger.log(self.log_level, "Resolution of %s failed: %s", url, e)
+            self.metrics.inc("failures", stage="resolve", reason=type(e).__name__)
+
+        if self.cache is not None:
+            if resolved:
+                self.cache.set(key, resolved)
+            else:
+                self.cache.set_failed(key)
+        return resolved
+
+    async def resolve_many(self, urls: list[str]) -> list[str]:
+        """
+        Resolve several URLs concurrently, in input order. Google News
+        articles among them share batchexecute requests.
+        """
+        return list(await asyncio.gather(*(self.resolve(url) for url in urls)))
 
     def _needs_redirect_resolution(self, url: str) -> bool:
         """Check if this URL actually needs redirect resolution."""
 
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-
-            # Check if it's a known redirect service (redirect IS needed)
-            redirect_domains = [
-                "news.google.com",
-                "bit.ly",
-                "goo.gl",
-                "t.co",
-                "tinyurl.com",
-                "ow.ly",
-                "buff.ly",
-                "ift.tt",
-                "dlvr.it",
-            ]
-
-            for redirect_domain in redirect_domains:
-                if domain == redirect_domain or domain.endswith("." + redirect_domain):
-                    if self.verbose:
-                        print(f"🔍 Redirect domain detected: {domain}")
-                    return True
-
-            # Check URL patterns that indicate redirects
-            redirect_patterns = [
-                r"/rss/articles/",  # Google News RSS
-                r"/amp/",  # AMP pages might need canonical resolution
-                r"/url\?q=",  # Google redirect URLs
-                r"utm_",  # Tracking parameters
-            ]
-
-            for pattern in redirect_patterns:
-                if re.search(pattern, url, re.IGNORECASE):
-                    if self.verbose:
-                        print(f"🔍 Redirect pattern detected: {pattern}")
-                    return True
-
-            # Default: Assume direct URL (no redirect needed)
-            if self.verbose:
-                print("✅ Assuming direct URL - no redirect resolution needed")
+        if self.registry.is_redirect_url(url):
+            logger.debug("Redirect domain detected: %s", url)
             return True
 
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠️ Error checking redirect need: {e}")
-            # On error, assume it needs resolution to be safe
+        if self.registry.matches_pattern(url):
+            logger.debug("Redirect pattern detected: %s", url)
             return True
 
+        # Direct publisher URL: skip resolution entirely
+        return False
+
     async def _resolve_google_news(self, url: str) -> str | None:
         """Resolve a Google News RSS 'articles/...' URL to the publisher URL."""
+        # 0️⃣ Old-style article IDs embed the publisher URL: no network needed
+        decoded = decode_article_id(url)
+        if decoded:
+            self.metrics.inc("gnews_offline_decodes")
+            return decoded
+
         try:
-            async with httpx.AsyncClient(
-                headers={
-                    "User-Agent": self.user_agent,
-                    "Referer": "https://news.google.com/",
-                },
-                timeout=self.timeout,
-                follow_redirects=True,
-            ) as client:
+            # 1️⃣ Fetch the article page once; a plain redirect may already
+            # land on the publisher, otherwise the same body feeds the parser
+            async with self._stream(
+                url, headers={"Referer": "https://news.google.com/"}
+            ) as resp:
+                final_url = str(resp.url)
+                if "news.google.com" not in urlparse(final_url).netloc.lower():
+                    return final_url
+
+                # 2️⃣ Scan the Google News HTML only up to the c-wiz[data-p] node
+                resp.raise_for_status()
+                scanner = HeadScanner(
+                    final_url,
+                    self._is_redirect_domain,
+                    want_data_p=True,
+                    max_bytes=self.max_scan_bytes,
+                    encoding=resp.charset_encoding,
+                )
+                await self._scan(resp, scanner)
+            self._record_saved(scanner.bytes_read)
 
-                # 1️⃣ Try a fast simple redirect first
-                direct = await self._try_simple_redirect(client, url)
-                if direct and "news.google.com" not in urlparse(direct).netloc.lower():
-                    return direct
+            if not scanner.data_p:
+                # fallback: meta-refresh or first non-Google link
+                return scanner.best(("refresh", "link"))
 
-                # 2️⃣ Fetch the Google News HTML
-                resp = await client.get(url)
-                resp.raise_for_status()
-                html = resp.text
-                soup = BeautifulSoup(html, "lxml")
-
-                node = soup.select_one("c-wiz[data-p]")
-                if not node:
-                    # fallback to html.parser if lxml fails
-                    soup = BeautifulSoup(html, "html.parser")
-                    node = soup.select_one("c-wiz[data-p]")
-                if not node:
-                    # fallback again: meta-refresh or first non-Google link
-                    return await self._extract_fallback_url(client, html, url)
-
-                data_p = node.get("data-p")
-                if not data_p:
-                    return await self._extract_fallback_url(client, html, url)
-
-                # 3️⃣ Parse data-p JSON (robust conversion)
-                obj = json.loads(data_p.replace("%.@.", '["garturlreq",'))
-                payload_obj = obj[:-6] + obj[-2:]
-                payload = {
-                    "f.req": json.dumps(
-                        [[["Fbv4je", json.dumps(payload_obj), "null", "generic"]]]
-                    )
-                }
+            # 3️⃣ Parse data-p JSON (robust conversion)
+            obj = json.loads(scanner.data_p.replace("%.@.", '["garturlreq",'))
+            payload_obj = obj[:-6] + obj[-2:]
 
-                # 4️⃣ Call Google's hidden batchexecute API
-                r = await client.post(
-                    self.gnews_batch_url, headers=self.gnews_headers, data=payload
-                )
-                r.raise_for_status()
-                txt = r.text.replace(")]}'", "", 1).strip()
-                outer = json.loads(txt)
-
-                article_url = None
-                for item in outer:
-                    if isinstance(item, list) and len(item) >= 3 and item[2]:
-                        try:
-                            inner = json.loads(item[2])
-                            if (
-                                isinstance(inner, list)
-                                and len(inner) >= 2
-                                and isinstance(inner[1], str)
-                            ):
-                                article_url = inner[1]
-                                break
-                        except Exception:
-                            continue
-
-                if article_url:
-                    return article_url
-
-                # fallback again if nothing found
-                return await self._extract_fallback_url(client, html, url)
+            # 4️⃣ Call Google's hidden batchexecute API, batched with any
+            # other articles being resolved at the same time
+            article_url = await self.gnews_decoder.decode(payload_obj)
+            if article_url:
+                return article_url
 
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠️ GoogleNews resolve failed: {e}")
-            return None
+            # fallback again if nothing found
+            return scanner.best(("refresh", "link"))
 
-    async def _extract_fallback_url(
-        self, client: httpx.AsyncClient, html: str, base_url: str
-    ) -> str | None:
-        """Fallback method if Google News batchexecute fails."""
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Meta refresh
-        meta = soup.find("meta", attrs={"http-equiv": re.compile("refresh", re.I)})
-        if meta and meta.get("content"):
-            m = re.search(r"url=([^;]+)", meta["content"], re.I)
-            if m:
-                found = m.group(1).strip("'\" ")
-                return urljoin(base_url, found)
-
-        # First non-Google anchor
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if href.startswith("http") and not self._is_redirect_domain(href):
-                return href
-
-        # Final attempt: follow redirect chain
-        return await self._try_simple_redirect(client, base_url)
-
-    async def _try_simple_redirect(
-        self, client: httpx.AsyncClient, url: str
-    ) -> str | None:
-        try:
-            resp = await client.get(url, follow_redirects=True)
-            final_url = str(resp.url)
-            if "news.google.com" not in urlparse(final_url).netloc.lower():
-                return final_url
-            return None
-        except Exception:
+        except Exception as e:
+            logger.log(self.log_level, "GoogleNews resolve of %s failed: %s", url, e)
+            self.metrics.inc("failures", stage="GoogleNews", reason=type(e).__name__)
             return None
 
-    async def _resolve_http(self, url: str) -> str | None:
-        """Resolve redirects using HTTP requests."""
+    async def probe(self, url: str) -> list[str]:
+        """
+        Follow the redirect chain of ``url`` hop by hop using HEAD requests
+        (or a GET closed before its body when HEAD is refused) and return
+        every URL visited, starting with ``url``. Stops at the first hop
+        outside the redirect services, after ``max_hops`` hops, or when a
+        URL repeats.
+        """
+        hops = [url]
+        seen = {normalize_url(url)}
+        current = url
+        for _ in range(self.max_hops):
+            location = await self._probe_hop(current)
+            if not location:
+                break
+            current = urljoin(current, location)
+            key = normalize_url(current)
+            if key in seen:
+                logger.log(self.log_level, "Redirect loop detected at %s", current)
+                self.metrics.inc("failures", stage="Probe", reason="loop")
+                break
+            seen.add(key)
+            hops.append(current)
+            if not self._is_redirect_domain(current):
+                break
+        return hops
+
+    async def _resolve_probe(self, url: str) -> str | None:
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=self.timeout,
-                headers={"User-Agent": self.user_agent},
-            ) as client:
-                resp = await client.get(url)
-                return str(resp.url)
+            hops = await self.probe(url)
         except Exception as e:
-            if self.verbose:
-                print(f"⚠️ HTTP resolve failed: {e}")
+            logger.log(self.log_level, "Probe resolve of %s failed: %s", url, e)
+            self.metrics.inc("failures", stage="Probe", reason=type(e).__name__)
             return None
+        final = hops[-1]
+        return None if self._is_redirect_domain(final) else final
+
+    async def _probe_hop(self, url: str) -> str | None:
+        """Return the Location of one redirect response, or None."""
+        async with self.scheduler.slot(url):
+            resp = await self.client.head(url, follow_redirects=False)
+        self._account_headers(resp)
+        if resp.status_code in (403, 405, 501):
+            # HEAD refused: a streamed GET, closed before the body is read
+            async with self._stream(url, follow_redirects=False) as resp:
+                pass
+        self.metrics.inc("probe_hops")
+        return resp.headers.get("location") if resp.is_redirect else None
+
+    def _account_headers(self, resp: httpx.Response):
+        self.scheduler.report(
+            str(resp.url), resp.status_code, resp.headers.get("retry-after")
+        )
+        self.metrics.inc("requests")
+        self.metrics.inc("bytes_downloaded", _header_bytes(resp))
 
-    async def _resolve_html(self, url: str) -> str | None:
-        """Resolve redirects by parsing HTML content."""
+    async def _resolve_http_html(self, url: str) -> tuple[str | None, str | None]:
+        """
+        Fetch the URL once, following redirects, and resolve it from that
+        single response: the final URL when the redirect chain already left
+        the redirect service (HTTP, without reading the body), otherwise the
+        redirect hints streamed from the body (HTML). Returns
+        ``(resolved_url, method)``.
+        """
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=self.timeout,
-                headers={"User-Agent": self.user_agent},
-            ) as client:
-                resp = await client.get(url)
+            async with self._stream(url) as resp:
                 final = str(resp.url)
-                soup = BeautifulSoup(resp.text, "html.parser")
-
-                # canonical / og / meta-refresh
-                for tag in [
-                    ("link", {"rel": "canonical"}, "href"),
-                    ("meta", {"property": "og:url"}, "content"),
-                    ("meta", {"name": "og:url"}, "content"),
-                ]:
-                    t = soup.find(tag[0], tag[1])
-                    if t and t.get(tag[2]):
-                        found_url = t[tag[2]]
-                        return str(urljoin(final, found_url))
-
-                meta_refresh = soup.find("meta", {"http-equiv": "refresh"})
-                if meta_refresh and meta_refresh.get("content"):
-                    m = re.search(r"url=(.*)", meta_refresh["content"], flags=re.I)
-                    if m:
-                        found_url = m.group(1).strip("\"' ")
-                        return str(urljoin(final, found_url))
-
-                # JS redirect
-                js_match = re.search(
-                    r'window\.location(?:\.replace)?\(["\'](.*?)["\']\)', resp.text
+                if not self._is_redirect_domain(final):
+                    return final, "HTTP"
+
+                scanner = HeadScanner(
+                    final,
+                    self._is_redirect_domain,
+                    max_bytes=self.max_scan_bytes,
+                    encoding=resp.charset_encoding,
                 )
-                if js_match:
-                    found_url = js_match.group(1)
-                    return str(urljoin(final, found_url))
-
-                # JSON-LD or first outbound link
-                for script in soup.find_all("script", type="application/ld+json"):
-                    try:
-                        data = json.loads(script.string or "{}")
-                        if isinstance(data, dict) and data.get("url"):
-                            found_url = data["url"]
-                            return str(urljoin(final, found_url))
-                    except Exception:
-                        pass
-
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
-                    if href.startswith("http") and not self._is_redirect_domain(href):
-                        return str(href)
-
-                return None
+                await self._scan(resp, scanner)
         except Exception as e:
-            if self.verbose:
-                print(f"⚠️ HTML resolve failed: {e}")
-            return None
+            logger.log(self.log_level, "HTTP resolve of %s failed: %s", url, e)
+            self.metrics.inc("failures", stage="HTTP", reason=type(e).__name__)
+            return None, None
+
+        # Previously a second GET of the same URL fed the HTML heuristics.
+        self._record_saved(scanner.bytes_read)
+        return scanner.best(), "HTML"
 
     async def _resolve_chromium(self, url: str) -> str | None:
         """Use Playwright as last resort."""
         if not PLAYWRIGHT_AVAILABLE:
             return None
-            
-        try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(user_agent=self.user_agent)
-                page = await context.new_page()
 
-                await page.goto(
+        try:
+            async with self.scheduler.slot(url), self.browser_pool.page(
+                user_agent=self.user_agent
+            ) as page:
+                response = await page.goto(
                     url, timeout=self.timeout * 1000, wait_until="domcontentloaded"
                 )
+                if response is not None:
+                    self.scheduler.report(
+                        response.url,
+                        response.status,
+                        response.headers.get("retry-after"),
+                    )
 
                 # Wait for potential redirects
                 for _ in range(5):
@@ -367,33 +631,58 @@ class RedirectResolver:
                         break
 
                 final_url = str(page.url)
-                await browser.close()
 
-                # Return None if it's still a redirect domain
-                return None if self._is_redirect_domain(final_url) else final_url
+            # Return None if it's still a redirect domain
+            return None if self._is_redirect_domain(final_url) else final_url
         except Exception as e:
-            if self.verbose:
-                print(f"⚠️ Chromium resolve failed: {e}")
+            logger.log(self.log_level, "Chromium resolve of %s failed: %s", url, e)
+            self.metrics.inc("failures", stage="Chromium", reason=type(e).__name__)
             return None
 
     def _is_redirect_domain(self, url: str) -> bool:
         """Check if URL is from a known redirect service."""
         if not url:
             return True
-
-        url = str(url)
-        domains = [
-            "news.google.com",
-            "bit.ly",
-            "goo.gl",
-            "t.co",
-            "tinyurl.com",
-            "ow.ly",
-        ]
-
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            return any(redirect_domain in domain for redirect_domain in domains)
-        except Exception:
-            return False
\ No newline at end of file
+        return self.registry.is_redirect_url(url)
+
+
+def _header_bytes(resp: httpx.Response) -> int:
+    return sum(len(k) + len(v) + 4 for k, v in resp.headers.raw)
+
+
+class _Attempt:
+    """
+    Times one resolution stage, counts it in ``resolutions`` when the block
+    sets ``result`` and feeds the outcome to the strategy stats; errors are
+    counted by the methods themselves. ``method`` may be refined inside the
+    block (HTTP vs HTML).
+    """
+
+    __slots__ = ("metrics", "strategy", "stage", "host", "method", "result", "started")
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        strategy: StrategyStats | None,
+        stage: str,
+        host: str,
+    ):
+        self.metrics = metrics
+        self.strategy = strategy
+        self.stage = stage
+        self.host = host
+        self.method = stage
+        self.result = None
+
+    def __enter__(self) -> "_Attempt":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        self.metrics.observe("method_seconds", elapsed, method=self.method)
+        if self.result:
+            self.metrics.inc("resolutions", method=self.method)
+        # Cancellation says nothing about the stage itself
+        if self.strategy is not None and exc_type is not asyncio.CancelledError:
+            self.strategy.record(self.host, self.stage, bool(self.result), elapsed)
@@ -0,0 +1,135 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResultStore:
+    """
+    Local SQLite store of extraction results keyed by ``(final_url, query)``.
+
+    Alongside the markdown it keeps the page's ``ETag``/``Last-Modified``
+    validators and a hash of the raw body, so a refetch can be a conditional
+    request and an unchanged page can reuse its stored extraction. Raw HTML
+    is kept zlib-compressed only when ``store_html`` is set.
+    """
+
+    def __init__(self, path: str = ":memory:", store_html: bool = False):
+        self.path = path
+        self.store_html = store_html
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "final_url TEXT NOT NULL, query TEXT NOT NULL, "
+            "etag TEXT, last_modified TEXT, content_hash TEXT, "
+            "markdown_raw TEXT NOT NULL, markdown_filtered TEXT NOT NULL, "
+            "html BLOB, stored_at REAL NOT NULL, "
+            "PRIMARY KEY (final_url, query))"
+        )
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def get(self, final_url: str, query: str | None) -> dict | None:
+        """The stored entry (record fields plus validators), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, content_hash, markdown_raw, "
+                "markdown_filtered, html FROM results "
+                "WHERE final_url = ? AND query = ?",
+                (final_url, query or ""),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, last_modified, body_hash, raw, filtered, html = row
+        return {
+            "markdown_raw": raw,
+            "markdown_filtered": filtered,
+            "html": zlib.decompress(html).decode("utf-8") if html else "",
+            "final_url": final_url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": body_hash,
+        }
+
+    def put(
+        self,
+        final_url: str,
+        query: str | None,
+        record: dict,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        body_hash: str | None = None,
+    ):
+        html = None
+        if self.store_html and record.get("html"):
+            html = zlib.compress(record["html"].encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (final_url, query, etag, "
+                "last_modified, content_hash, markdown_raw, markdown_filtered, "
+                "html, stored_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    final_url,
+                    query or "",
+                    etag,
+                    last_modified,
+                    body_hash,
+                    record.get("markdown_raw", ""),
+                    record.get("markdown_filtered", ""),
+                    html,
+                    time.time(),
+                ),
+            )
+            self._db.commit()
+
+    def revalidated(
+        self,
+        final_url: str,
+        query: str | None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        body_hash: str | None = None,
+    ):
+        """Refresh validators of an entry confirmed unchanged by the origin."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE results SET etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified), "
+                "content_hash = COALESCE(?, content_hash), stored_at = ? "
+                "WHERE final_url = ? AND query = ?",
+                (etag, last_modified, body_hash, time.time(), final_url, query or ""),
+            )
+            self._db.commit()
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+        }
+
+    def close(self):
+        self._db.close()
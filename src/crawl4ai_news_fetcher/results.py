@@ -0,0 +1,170 @@
+import gzip
+import json
+import sys
+from dataclasses import dataclass
+from typing import AsyncIterable, TextIO
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+RESULT_FIELDS = ("markdown_raw", "markdown_filtered", "html", "final_url")
+HTML_CODECS = (None, "gzip", "zstd")
+
+
+def compress_html(html: str, codec: str | None) -> str | bytes:
+    if codec is None:
+        return html
+    data = html.encode("utf-8")
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"unknown html codec {codec!r}")
+
+
+def decompress_html(data: str | bytes, codec: str | None) -> str:
+    if codec is None:
+        return data
+    if codec == "gzip":
+        return gzip.decompress(data).decode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"unknown html codec {codec!r}")
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """
+    Compact fetch result. Fields left out by the fetcher's ``fields`` option
+    stay None, as does ``duplicate_of`` unless the article is a near-duplicate.
+    The HTML is held as given by ``html_codec`` (plain text, or gzip/zstd
+    bytes) and only decoded when ``html`` is read.
+    """
+
+    final_url: str
+    markdown_raw: str | None = None
+    markdown_filtered: str | None = None
+    html_data: str | bytes | None = None
+    html_codec: str | None = None
+    duplicate_of: str | None = None
+
+    @property
+    def html(self) -> str | None:
+        if self.html_data is None:
+            return None
+        return decompress_html(self.html_data, self.html_codec)
+
+    def to_dict(self) -> dict:
+        """The materialized fields as a plain dict (HTML decoded)."""
+        record = {}
+        for field in RESULT_FIELDS + ("duplicate_of",):
+            value = getattr(self, field)
+            if value is not None:
+                record[field] = value
+        return record
+
+
+class ResultShaper:
+    """Selects result fields and the HTML representation handed to callers."""
+
+    def __init__(
+        self,
+        fields: tuple[str, ...] | None = None,
+        html_codec: str | None = None,
+        compact: bool = False,
+    ):
+        fields = tuple(fields) if fields is not None else RESULT_FIELDS
+        unknown = set(fields) - set(RESULT_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown result fields: {sorted(unknown)}")
+        if html_codec not in HTML_CODECS:
+            raise ValueError(f"html_codec must be one of {HTML_CODECS}")
+        if html_codec == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("html_codec='zstd' requires the 'zstandard' package")
+        if html_codec is not None and not compact:
+            raise ValueError("compressed HTML requires compact=True results")
+
+        self.fields = fields
+        self.html_codec = html_codec
+        self.compact = compact
+
+    @property
+    def wants_html(self) -> bool:
+        return "html" in self.fields
+
+    def shape(self, record: dict) -> dict | FetchResult:
+        if not self.compact:
+            shaped = {k: record[k] for k in self.fields if k in record}
+            if "duplicate_of" in record:
+                shaped["duplicate_of"] = record["duplicate_of"]
+            return shaped
+
+        html = record.get("html") if self.wants_html else None
+        return FetchResult(
+            final_url=record["final_url"],
+            markdown_raw=(
+                record.get("markdown_raw") if "markdown_raw" in self.fields else None
+            ),
+            markdown_filtered=(
+                record.get("markdown_filtered")
+                if "markdown_filtered" in self.fields
+                else None
+            ),
+            html_data=compress_html(html, self.html_codec) if html else None,
+            html_codec=self.html_codec if html else None,
+            duplicate_of=record.get("duplicate_of"),
+        )
+
+
+class JsonlWriter:
+    """
+    Streams ``(url, result)`` pairs to an NDJSON file, one object per line,
+    so batch results go to disk instead of accumulating in memory. A path
+    ending in ``.gz`` is written gzip-compressed; ``-`` writes to stdout.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._fh: TextIO | None = None
+
+    def open(self) -> "JsonlWriter":
+        if self._fh is None:
+            if self.path == "-":
+                self._fh = sys.stdout
+            elif self.path.endswith(".gz"):
+                self._fh = gzip.open(self.path, "wt", encoding="utf-8")
+            else:
+                self._fh = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def write(self, url: str, result: dict | FetchResult | None):
+        if isinstance(result, FetchResult):
+            result = result.to_dict()
+        line = {"url": url, "ok": result is not None, **(result or {})}
+        self.open()._fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    async def write_all(self, results: AsyncIterable) -> int:
+        """Drain an async iterator such as ``fetch_many`` into the file."""
+        async for url, result in results:
+            self.write(url, result)
+        return self.count
+
+    def close(self):
+        if self._fh is not None:
+            if self._fh is sys.stdout:
+                self._fh.flush()
+            else:
+                self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "JsonlWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
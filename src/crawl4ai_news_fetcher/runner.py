@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+import zlib
+from typing import Iterable, Iterator
+
+from .content_fetcher import NewsContentFetcher
+from .scheduler import HostScheduler
+from .urls import RedirectRegistry, normalize_url
+
+# How long the merge loop waits on results before checking worker health
+_POLL_INTERVAL = 1.0
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_redirects = RedirectRegistry()
+
+
+def shard_of(url: str, shards: int) -> int:
+    """
+    Stable shard index of ``url`` (the same in every process). Publisher
+    URLs are sharded by host; Google News and shortener links all share a
+    handful of hosts, so they are spread by their full normalized URL.
+    """
+    if _redirects.is_redirect_url(url):
+        key = normalize_url(url)
+    else:
+        key = HostScheduler.host_of(url)
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+class ShardedRunner:
+    """
+    Runs ``NewsContentFetcher.fetch_many`` across ``workers`` processes.
+
+    Direct publisher URLs are sharded by a hash of their host, so they all
+    reach one worker. Redirect-service links (Google News, shorteners) are
+    spread across workers by their full URL, so a publisher host reached
+    through them may be fetched from every worker: per-host limits then
+    hold per worker, not overall, and each worker learns and caches on its
+    own. Every worker owns its fetcher, browser and resolver, built from
+    ``fetcher_kwargs``, which must be picklable. Results come back through one
+    stream, either as they complete or (``ordered=True``) in input order.
+    At most ``queue_size`` URLs are buffered per worker, so an endless input
+    iterable is consumed lazily. Spawned workers do not inherit the parent's
+    logging setup; each logs to stderr at ``log_level``.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        fetcher_kwargs: dict | None = None,
+        ordered: bool = False,
+        queue_size: int = 1000,
+        start_method: str = "spawn",
+        log_level: int = logging.WARNING,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.fetcher_kwargs = fetcher_kwargs or {}
+        self.ordered = ordered
+        self.queue_size = queue_size
+        self.log_level = log_level
+        # Forking a process that already runs an event loop or a browser is
+        # unsafe, hence spawn by default.
+        self._context = multiprocessing.get_context(start_method)
+
+    def run(
+        self, urls: Iterable[str], query: str | None = None
+    ) -> Iterator[tuple[str, dict | None]]:
+        """Yield ``(url, result)`` pairs; ``result`` is None on failure."""
+        inboxes = [
+            self._context.Queue(maxsize=self.queue_size) for _ in range(self.workers)
+        ]
+        results = self._context.Queue()
+        processes = [
+            self._context.Process(
+                target=_worker,
+                args=(inbox, results, self.fetcher_kwargs, query, self.log_level),
+                daemon=True,
+            )
+            for inbox in inboxes
+        ]
+        for process in processes:
+            process.start()
+
+        stop = threading.Event()
+        feed_errors: list[BaseException] = []
+        feeder = threading.Thread(
+            target=_feed, args=(urls, inboxes, stop, feed_errors), daemon=True
+        )
+        feeder.start()
+
+        pending: dict[int, tuple[str, dict | None]] = {}
+        next_seq = 0
+        finished = 0
+        try:
+            while finished < self.workers:
+                try:
+                    item = results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    dead = [p for p in processes if p.exitcode not in (None, 0)]
+                    if dead:
+                        raise RuntimeError(
+                            f"fetch worker exited with code {dead[0].exitcode}"
+                        )
+                    continue
+                if item is None:
+                    finished += 1
+                    continue
+                if len(item) == 2:
+                    raise RuntimeError(f"fetch worker failed:\n{item[1]}")
+
+                seq, url, result = item
+                if not self.ordered:
+                    yield url, result
+                    continue
+                pending[seq] = (url, result)
+                while next_seq in pending:
+                    yield pending.pop(next_seq)
+                    next_seq += 1
+            # Workers are done; ordered leftovers can only follow gaps left by
+            # URLs that never produced a result.
+            for seq in sorted(pending):
+                yield pending[seq]
+            # Surface a failure of the input iterable
+            if feed_errors:
+                raise feed_errors[0]
+        finally:
+            stop.set()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+
+def _feed(
+    urls: Iterable[str],
+    inboxes: list,
+    stop: threading.Event,
+    errors: list[BaseException],
+):
+    """Distribute ``(seq, url)`` to the shard queues, then stop every worker."""
+    try:
+        for seq, url in enumerate(urls):
+            inbox = inboxes[shard_of(url, len(inboxes))]
+            while not stop.is_set():
+                try:
+                    inbox.put((seq, url), timeout=_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        if not stop.is_set():
+            for inbox in inboxes:
+                inbox.put(None)
+
+
+def _worker(
+    inbox, results, fetcher_kwargs: dict, query: str | None, log_level: int
+):
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    asyncio.run(_worker_main(inbox, results, fetcher_kwargs, query))
+
+
+async def _worker_main(inbox, results, fetcher_kwargs: dict, query: str | None):
+    loop = asyncio.get_running_loop()
+    seqs: dict[str, list[int]] = {}
+
+    async def receive():
+        while True:
+            item = await loop.run_in_executor(None, inbox.get)
+            if item is None:
+                return
+            seq, url = item
+            seqs.setdefault(url, []).append(seq)
+            yield url
+
+    try:
+        async with NewsContentFetcher(**fetcher_kwargs) as fetcher:
+            async for url, result in fetcher.fetch_many(receive(), query):
+                results.put((seqs[url].pop(0), url, result))
+                if not seqs[url]:
+                    del seqs[url]
+    except BaseException:
+        results.put(("error", traceback.format_exc()))
+        raise
+    finally:
+        results.put(None)
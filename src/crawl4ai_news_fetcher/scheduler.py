@@ -0,0 +1,109 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+BACKOFF_STATUSES = {429, 503}
+
+
+class _HostState:
+    __slots__ = ("semaphore", "next_allowed", "backoff_until", "failures")
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.next_allowed = 0.0
+        self.backoff_until = 0.0
+        self.failures = 0
+
+
+class HostScheduler:
+    """
+    Per-host politeness: caps concurrent requests and request rate for each
+    host and backs a host off when it answers 429/503, honouring
+    ``Retry-After`` when present and exponential backoff otherwise.
+
+    Callers should take a host slot *before* any global concurrency slot,
+    so requests queued behind a busy or throttled host do not hold global
+    capacity that requests to idle hosts could use.
+    """
+
+    def __init__(
+        self,
+        per_host_concurrency: int = 4,
+        per_host_rate: float | None = None,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._hosts: dict[str, _HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        try:
+            return (urlparse(str(url)).hostname or "").lower()
+        except ValueError:
+            return ""
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.per_host_concurrency)
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for a concurrency slot and the rate/backoff window of a host."""
+        state = self._state(self.host_of(url))
+        async with state.semaphore:
+            while True:
+                now = time.monotonic()
+                ready_at = max(state.next_allowed, state.backoff_until)
+                if ready_at <= now:
+                    break
+                await asyncio.sleep(ready_at - now)
+            if self.per_host_rate:
+                state.next_allowed = time.monotonic() + 1.0 / self.per_host_rate
+            yield
+
+    def report(self, url: str, status: int | None, retry_after: str | None = None):
+        """Feed a response status back; 429/503 push the host's next slot out."""
+        state = self._state(self.host_of(url))
+        if status in BACKOFF_STATUSES:
+            state.failures += 1
+            delay = self._parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.base_backoff * 2 ** (state.failures - 1)
+            delay = min(delay, self.max_backoff)
+            state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+        elif status is not None and status < 500:
+            state.failures = 0
+
+    def ready_in(self, url: str) -> float:
+        """Seconds until the host's rate/backoff window next opens (0 if open)."""
+        state = self._hosts.get(self.host_of(url))
+        if state is None:
+            return 0.0
+        ready_at = max(state.next_allowed, state.backoff_until)
+        return max(0.0, ready_at - time.monotonic())
+
+    def backoff_remaining(self, url: str) -> float:
+        state = self._hosts.get(self.host_of(url))
+        if state is None:
+            return 0.0
+        return max(0.0, state.backoff_until - time.monotonic())
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key: the first caller runs the
+    work, later callers with the same key await the same task until it
+    finishes. Nothing is cached once the task completes.
+
+    A caller being cancelled leaves the work running for the others; when
+    the last caller of a key is cancelled, the work is cancelled too, and
+    that caller returns only once it has stopped.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._waiters: dict[asyncio.Future, int] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            # Shield so one cancelled caller does not cancel the shared work.
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self._waiters[future] == 1 and not future.done():
+                # Nobody is left to use the result; later callers start anew
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                future.cancel()
+                await asyncio.wait([future])
+            raise
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved when every waiter was cancelled.
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,155 @@
+import json
+import os
+import random
+from collections import OrderedDict
+
+# Rough seconds per attempt of each resolver stage, used until a host has
+# its own measurements; unknown stages count as DEFAULT_STAGE_COST.
+STAGE_COSTS = {
+    "GoogleNews": 0.2,
+    "Probe": 0.3,
+    "HTTP": 0.5,
+    "Chromium": 5.0,
+}
+DEFAULT_STAGE_COST = 1.0
+
+
+class StrategyStats:
+    """
+    Per-host record of which resolution stages succeed, used to order them.
+
+    Stages are tried by expected cost to an answer on the host: mean latency
+    over smoothed success rate, ties keeping the default order. A stage only
+    moves ahead of a cheaper one when it is more reliable by more than it is
+    slower, so one link that only Chromium could resolve does not put the
+    browser in front of two HEAD requests for every later link. Latencies
+    start from ``stage_costs`` and follow the host's measurements as they
+    accumulate. A stage whose success rate is below ``skip_below`` after
+    ``min_samples`` attempts is skipped outright. With probability
+    ``explore`` the default order is used instead so skipped stages get a
+    chance to recover. Counts are halved past ``max_samples`` to keep
+    adapting, and only the ``max_hosts`` most recent hosts are kept.
+
+    With ``path`` set, the stats are loaded from and saved to a JSON file.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str | None = None,
+        min_samples: int = 5,
+        skip_below: float = 0.05,
+        explore: float = 0.05,
+        max_samples: int = 200,
+        max_hosts: int = 10000,
+        stage_costs: dict[str, float] | None = None,
+    ):
+        self.path = path
+        self.stage_costs = {**STAGE_COSTS, **(stage_costs or {})}
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.explore = explore
+        self.max_samples = max_samples
+        self.max_hosts = max_hosts
+        # host -> stage -> [successes, attempts, total_seconds]
+        self._hosts: OrderedDict[str, dict[str, list[float]]] = OrderedDict()
+        self.reordered = 0
+        self.skipped = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def order(self, host: str, stages: list[str]) -> list[str]:
+        """``stages`` (in default order) rearranged for ``host``."""
+        stats = self._hosts.get(host)
+        if not stats or random.random() < self.explore:
+            return list(stages)
+        self._hosts.move_to_end(host)
+
+        ranked = sorted(
+            stages,
+            key=lambda stage: (
+                self._cost(stage, stats.get(stage)) / self._rate(stats.get(stage)),
+                stages.index(stage),
+            ),
+        )
+        kept = [stage for stage in ranked if not self._failing(stats.get(stage))]
+        if not kept:
+            # Everything looks broken on this host: still try, in default order
+            return list(stages)
+        if len(kept) < len(ranked):
+            self.skipped += len(ranked) - len(kept)
+        if kept != list(stages)[: len(kept)]:
+            self.reordered += 1
+        return kept
+
+    def record(self, host: str, stage: str, success: bool, elapsed: float):
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = {}
+            if len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        entry = stats.setdefault(stage, [0, 0, 0.0])
+        entry[0] += bool(success)
+        entry[1] += 1
+        entry[2] += elapsed
+        if entry[1] > self.max_samples:
+            entry[0] /= 2
+            entry[1] /= 2
+            entry[2] /= 2
+
+    def snapshot(self, host: str) -> dict:
+        """Success rate, attempts and mean latency of each stage on ``host``."""
+        return {
+            stage: {
+                "success_rate": s / n if n else 0.0,
+                "attempts": n,
+                "avg_s": t / n if n else 0.0,
+            }
+            for stage, (s, n, t) in self._hosts.get(host, {}).items()
+        }
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hosts": len(self._hosts),
+            "reordered": self.reordered,
+            "skipped": self.skipped,
+        }
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != self.VERSION:
+            return
+        self._hosts = OrderedDict(
+            (host, {stage: list(entry) for stage, entry in stages.items()})
+            for host, stages in data.get("hosts", {}).items()
+        )
+
+    def save(self):
+        if not self.path:
+            return
+        # Write-then-rename so a crash never leaves a truncated file behind
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": self.VERSION, "hosts": self._hosts}, fh)
+        os.replace(tmp, self.path)
+
+    def _rate(self, entry: list[float] | None) -> float:
+        if entry is None:
+            return 0.5
+        return (entry[0] + 1) / (entry[1] + 2)
+
+    def _cost(self, stage: str, entry: list[float] | None) -> float:
+        # The prior counts as one attempt, so a single slow or fast outlier
+        # cannot swing the estimate on its own
+        prior = self.stage_costs.get(stage, DEFAULT_STAGE_COST)
+        if entry is None:
+            return prior
+        return (entry[2] + prior) / (entry[1] + 1)
+
+    def _failing(self, entry: list[float] | None) -> bool:
+        if entry is None or entry[1] < self.min_samples:
+            return False
+        return entry[0] / entry[1] < self.skip_below
@@ -0,0 +1,116 @@
+import re
+from typing import Iterable
+from urllib.parse import urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a dedup/cache key: lower-case scheme and
+    host, drop default ports and the fragment, and give bare hosts a "/"
+    path. The query string is kept as-is since its order can be significant.
+    """
+    try:
+        parts = urlsplit(str(url).strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return str(url)
+
+    netloc = f"[{host}]" if ":" in host else host
+    if parts.username:
+        userinfo = parts.username
+        if parts.password:
+            userinfo += ":" + parts.password
+        netloc = f"{userinfo}@{netloc}"
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        netloc += f":{port}"
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+DEFAULT_REDIRECT_DOMAINS = (
+    "news.google.com",
+    "bit.ly",
+    "goo.gl",
+    "t.co",
+    "tinyurl.com",
+    "ow.ly",
+    "buff.ly",
+    "ift.tt",
+    "dlvr.it",
+)
+
+DEFAULT_REDIRECT_PATTERNS = (
+    r"/rss/articles/",  # Google News RSS
+    r"/amp/",  # AMP pages might need canonical resolution
+    r"/url\?q=",  # Google redirect URLs
+    r"utm_",  # Tracking parameters
+)
+
+
+class RedirectRegistry:
+    """
+    Shortener / redirect-service domains plus URL patterns that call for
+    redirect resolution.
+
+    Domains match on whole labels (``t.co`` matches ``t.co`` and
+    ``www.t.co`` but not ``microsoft.com``) via a hash-set lookup per host
+    suffix; the patterns are compiled into a single regex.
+    """
+
+    def __init__(
+        self,
+        domains: Iterable[str] = DEFAULT_REDIRECT_DOMAINS,
+        patterns: Iterable[str] = DEFAULT_REDIRECT_PATTERNS,
+    ):
+        self._domains: set[str] = set()
+        for domain in domains:
+            self.add_domain(domain)
+        self._patterns = list(patterns)
+        self._compile()
+
+    def add_domain(self, domain: str):
+        self._domains.add(domain.lower().strip().strip("."))
+
+    def remove_domain(self, domain: str):
+        self._domains.discard(domain.lower().strip().strip("."))
+
+    def add_pattern(self, pattern: str):
+        self._patterns.append(pattern)
+        self._compile()
+
+    @property
+    def domains(self) -> frozenset[str]:
+        return frozenset(self._domains)
+
+    def is_redirect_host(self, host: str) -> bool:
+        host = host.lower().rstrip(".")
+        while host:
+            if host in self._domains:
+                return True
+            _, _, host = host.partition(".")
+        return False
+
+    def is_redirect_url(self, url: str) -> bool:
+        try:
+            host = urlsplit(str(url)).hostname
+        except ValueError:
+            return False
+        return bool(host) and self.is_redirect_host(host)
+
+    def matches_pattern(self, url: str) -> bool:
+        return self._regex is not None and self._regex.search(url) is not None
+
+    def needs_resolution(self, url: str) -> bool:
+        """False for direct URLs, which can be fetched as they are."""
+        return self.is_redirect_url(url) or self.matches_pattern(url)
+
+    def _compile(self):
+        self._regex = (
+            re.compile("|".join(f"(?:{p})" for p in self._patterns), re.IGNORECASE)
+            if self._patterns
+            else None
+        )
@@ -0,0 +1,68 @@
+import time
+
+from crawl4ai_news_fetcher.cache import ResolutionCache
+
+
+def test_hit_and_miss():
+    cache = ResolutionCache()
+    assert cache.get("https://bit.ly/a") == (False, None)
+    cache.set("https://bit.ly/a", "https://pub.com/a")
+    assert cache.get("https://bit.ly/a") == (True, "https://pub.com/a")
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_negative_hit():
+    cache = ResolutionCache()
+    cache.set_failed("https://bit.ly/broken")
+    assert cache.get("https://bit.ly/broken") == (True, None)
+    assert cache.stats["negative_hits"] == 1
+
+
+def test_entries_expire():
+    cache = ResolutionCache(ttl=0.05, negative_ttl=0.05)
+    cache.set("https://bit.ly/a", "https://pub.com/a")
+    cache.set_failed("https://bit.ly/b")
+    cache.set("https://bit.ly/c", "https://pub.com/c", ttl=60)
+    time.sleep(0.1)
+    assert cache.get("https://bit.ly/a") == (False, None)
+    assert cache.get("https://bit.ly/b") == (False, None)
+    assert cache.get("https://bit.ly/c") == (True, "https://pub.com/c")
+
+
+def test_lru_eviction():
+    cache = ResolutionCache(max_size=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    cache.get("a")
+    cache.set("c", "C")
+    assert len(cache) == 2
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "A")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResolutionCache(path=path)
+    cache.set("https://bit.ly/a", "https://pub.com/a")
+    cache.set_failed("https://bit.ly/b")
+    cache.close()
+
+    reopened = ResolutionCache(path=path)
+    assert len(reopened) == 0
+    assert reopened.get("https://bit.ly/a") == (True, "https://pub.com/a")
+    assert reopened.get("https://bit.ly/b") == (True, None)
+    assert reopened.stats["disk_hits"] == 2
+    reopened.close()
+
+
+def test_purge_and_clear(tmp_path):
+    cache = ResolutionCache(path=str(tmp_path / "cache.db"))
+    cache.set("a", "A", ttl=-1)
+    cache.set("b", "B")
+    cache.purge_expired()
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("b") == (False, None)
+    cache.close()
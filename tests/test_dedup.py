@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from crawl4ai_news_fetcher.dedup import (
+    DuplicateDetector,
+    LeadScanner,
+    SimHashIndex,
+    hamming,
+    lead_text,
+    simhash,
+)
+
+
+def words(seed: int, count: int = 200) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(count))
+
+
+def flip(fingerprint: int, *bits: int) -> int:
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def test_simhash_is_stable_and_close_for_similar_text():
+    text = words(1)
+    edited = text.replace(text.split()[100], "changed", 1)
+    assert simhash(text) == simhash(text)
+    assert hamming(simhash(text), simhash(edited)) <= 8
+    assert hamming(simhash(text), simhash(words(2))) >= 16
+
+
+def test_index_finds_fingerprints_within_max_distance():
+    index = SimHashIndex(max_distance=3)
+    base = random.Random(0).getrandbits(64)
+    index.add(base, "a")
+    # Spread the flipped bits over every band
+    assert index.query(flip(base, 0, 20, 40)) == ("a", 3)
+    assert index.query(flip(base, 0, 20, 40, 60)) is None
+
+
+def test_index_returns_closest_match():
+    index = SimHashIndex()
+    base = random.Random(1).getrandbits(64)
+    index.add(flip(base, 1, 2), "far")
+    index.add(flip(base, 3), "near")
+    assert index.query(base) == ("near", 1)
+
+
+def test_index_round_trips_through_dict():
+    index = SimHashIndex(bands=8, max_distance=5)
+    rng = random.Random(2)
+    for i in range(50):
+        index.add(rng.getrandbits(64), f"k{i}")
+    restored = SimHashIndex.from_dict(index.to_dict())
+    assert len(restored) == 50
+    fingerprint, key = index.to_dict()["entries"][17]
+    assert restored.query(fingerprint) == (key, 0)
+
+
+@pytest.mark.parametrize(
+    "bands,max_distance,bits", [(3, 3, 64), (4, 5, 64), (5, 3, 64)]
+)
+def test_index_rejects_lossy_banding(bands, max_distance, bits):
+    with pytest.raises(ValueError):
+        SimHashIndex(bits=bits, bands=bands, max_distance=max_distance)
+
+
+def test_lead_text_drops_site_suffix():
+    html = (
+        "<html><head><title>Rates rise again | Daily Paper</title></head>"
+        "<body><p>one two three</p></body></html>"
+    )
+    assert lead_text(html) == "Rates rise again one two three"
+
+
+def test_lead_scanner_stops_once_the_lead_is_read():
+    html = (
+        "<html><head><title>Story | Site</title></head><body>"
+        f"<p>{words(5, 100)}</p><div>{'x' * 100_000}</div></body></html>"
+    ).encode()
+    scanner = LeadScanner(words=60)
+    for start in range(0, len(html), 512):
+        if scanner.feed(html[start : start + 512]):
+            break
+    scanner.close()
+    assert scanner.text() == lead_text(html.decode(), 60)
+    assert scanner.bytes_read < 2048
+
+
+def test_lead_scanner_byte_cap():
+    html = f"<html><body><div>{'x' * 10_000}</div><p>late</p></body></html>"
+    scanner = LeadScanner(max_bytes=1000)
+    assert not scanner.feed(html[:500].encode())
+    assert scanner.feed(html[500:1500].encode())
+    scanner.close()
+    assert scanner.text() == ""
+
+
+def test_detector_flags_content_copies(tmp_path):
+    path = str(tmp_path / "dedup.json")
+    detector = DuplicateDetector(path)
+    text = words(3)
+    original, fingerprint = detector.match_content("https://a.com/1", text)
+    assert original is None
+    detector.add("https://a.com/1", fingerprint, None)
+    assert detector.match_content("https://a.com/1", text)[0] is None
+    assert detector.match_content("https://b.com/1", text)[0] == "https://a.com/1"
+    detector.save()
+
+    reloaded = DuplicateDetector(path)
+    assert reloaded.match_content("https://c.com/1", text)[0] == "https://a.com/1"
+
+
+def test_detector_ignores_thin_content():
+    detector = DuplicateDetector(min_content_words=50)
+    assert detector.match_content("https://a.com/1", "") == (None, None)
+    thin = "Please enable JavaScript to continue"
+    original, fingerprint = detector.match_content("https://a.com/1", thin)
+    assert (original, fingerprint) == (None, None)
+    detector.add("https://a.com/1", fingerprint, None)
+    assert detector.stats["articles"] == 0
+    assert detector.match_content("https://b.com/1", thin)[0] is None
+
+
+def test_detector_requires_a_long_enough_lead():
+    detector = DuplicateDetector(min_lead_words=25)
+    short = "<html><head><title>Hi</title></head><body><p>a b c</p></body></html>"
+    assert detector.lead_fingerprint(short) is None
+    long = f"<html><head><title>Hi</title></head><body><p>{words(4)}</p></body></html>"
+    fingerprint = detector.lead_fingerprint(long)
+    assert fingerprint is not None
+    detector.add("https://a.com/1", simhash(words(4)), fingerprint)
+    assert detector.match_lead("https://b.com/1", fingerprint) == "https://a.com/1"
+    assert detector.match_lead("https://a.com/1", fingerprint) is None
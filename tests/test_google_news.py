@@ -0,0 +1,118 @@
+import base64
+import json
+
+import pytest
+
+from crawl4ai_news_fetcher.google_news import (
+    build_batch_request,
+    decode_article_id,
+    parse_batch_response,
+)
+
+
+def article_url(target: str, query: str = "?oc=5") -> str:
+    """An old-style ``CBMi...`` article URL embedding ``target``."""
+    encoded = target.encode()
+    length = len(encoded)
+    if length < 0x80:
+        varint = bytes([length])
+    else:
+        varint = bytes([length & 0x7F | 0x80, length >> 7])
+    message = b"\x08\x13\x22" + varint + encoded + b"\xd2\x01\x00"
+    article_id = base64.urlsafe_b64encode(message).decode().rstrip("=")
+    return f"https://news.google.com/rss/articles/{article_id}{query}"
+
+
+def entry(url, index=None) -> list:
+    item = ["wrb.fr", "Fbv4je", json.dumps(["garturlres", url, 1]), None, None, None]
+    if index is not None:
+        item.append(str(index))
+    return item
+
+
+def response(*entries) -> str:
+    return ")]}'\n\n" + json.dumps(list(entries) + [["di", 42], ["af.httprm", 41]])
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        "https://pub.com/a",
+        "https://www.example-news.com/world/2024/" + "long-slug-" * 20 + ".html",
+    ],
+)
+def test_decode_article_id(target):
+    assert decode_article_id(article_url(target)) == target
+    assert decode_article_id(article_url(target, query="")) == target
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://news.google.com/rss/articles/",
+        "https://news.google.com/topics/CAAqBggKIgA",
+        "https://news.google.com/rss/articles/%%%",
+        # New-style opaque token: decodes to bytes without a URL
+        "https://news.google.com/rss/articles/"
+        + base64.urlsafe_b64encode(b"\x08\x13\x22\x05AU_yq").decode().rstrip("="),
+        # Truncated message claiming a longer string than it holds
+        "https://news.google.com/rss/articles/"
+        + base64.urlsafe_b64encode(b"\x08\x13\x22\x40https://").decode(),
+    ],
+)
+def test_decode_article_id_rejects(url):
+    assert decode_article_id(url) is None
+
+
+def test_build_batch_request_numbers_calls_from_one():
+    calls = json.loads(build_batch_request([["a"], ["b"]])["f.req"])[0]
+    assert [call[3] for call in calls] == ["1", "2"]
+    assert json.loads(calls[1][1]) == ["b"]
+
+
+def test_parse_batch_response_by_index():
+    text = response(entry("https://pub.com/b", 2), entry("https://pub.com/a", 1))
+    assert parse_batch_response(text, 2) == ["https://pub.com/a", "https://pub.com/b"]
+
+
+def test_parse_batch_response_missing_entry_stays_none():
+    text = response(entry("https://pub.com/c", 3), entry("https://pub.com/a", 1))
+    assert parse_batch_response(text, 3) == [
+        "https://pub.com/a",
+        None,
+        "https://pub.com/c",
+    ]
+
+
+def test_parse_batch_response_positional_without_indexes():
+    text = response(entry("https://pub.com/a"), entry("https://pub.com/b"))
+    assert parse_batch_response(text, 3) == [
+        "https://pub.com/a",
+        "https://pub.com/b",
+        None,
+    ]
+
+
+def test_parse_batch_response_no_positional_guess_when_indexed():
+    # The unindexed entry could belong to either open call
+    text = response(entry("https://pub.com/b", 2), entry("https://pub.com/x"))
+    assert parse_batch_response(text, 3) == [None, "https://pub.com/b", None]
+
+
+def test_parse_batch_response_single_call():
+    assert parse_batch_response(response(entry("https://pub.com/a")), 1) == [
+        "https://pub.com/a"
+    ]
+    assert parse_batch_response(response(entry("https://pub.com/a", 7)), 1) == [
+        "https://pub.com/a"
+    ]
+
+
+def test_parse_batch_response_skips_malformed_entries():
+    text = response(
+        ["wrb.fr", "Fbv4je", None],
+        ["wrb.fr", "Fbv4je", "not json"],
+        ["wrb.fr", "Fbv4je", json.dumps(["garturlres", None]), None, None, None, "1"],
+        entry("https://pub.com/b", 2),
+    )
+    assert parse_batch_response(text, 2) == [None, "https://pub.com/b"]
@@ -0,0 +1,122 @@
+import itertools
+
+import pytest
+
+from crawl4ai_news_fetcher.html_scan import HeadScanner
+
+BASE = "https://news.google.com/rss/articles/abc"
+
+TARGETS = {kind: f"https://pub.com/{kind}" for kind in HeadScanner.PRIORITY}
+HINTS = {
+    "canonical": f'<link rel="canonical" href="{TARGETS["canonical"]}">',
+    "og_url": f'<meta property="og:url" content="{TARGETS["og_url"]}">',
+    "refresh": (
+        f'<meta http-equiv="refresh" content="0; url={TARGETS["refresh"]}">'
+    ),
+    "js": f'<script>window.location.replace("{TARGETS["js"]}")</script>',
+    "json_ld": (
+        '<script type="application/ld+json">'
+        f'{{"url": "{TARGETS["json_ld"]}"}}</script>'
+    ),
+    "link": f'<a href="{TARGETS["link"]}">story</a>',
+}
+
+
+def is_redirect_domain(url: str) -> bool:
+    return "news.google.com" in url
+
+
+def page(kinds, filler: int = 0) -> bytes:
+    head = "".join(HINTS[k] for k in kinds if k in HeadScanner.HEAD_HINTS)
+    body = "".join(HINTS[k] for k in kinds if k not in HeadScanner.HEAD_HINTS)
+    padding = "<p>%s</p>" % ("lorem ipsum " * filler)
+    return (
+        f"<html><head><title>t</title>{head}</head>"
+        f"<body>{padding}{body}{padding}</body></html>"
+    ).encode()
+
+
+class FullScanner(HeadScanner):
+    """Never stops early, so its answer is the one for the whole page."""
+
+    def _decisive(self) -> bool:
+        return False
+
+
+def scan(html: bytes, chunk_size: int, cls=HeadScanner) -> HeadScanner:
+    scanner = cls(BASE, is_redirect_domain)
+    for start in range(0, len(html), chunk_size):
+        if scanner.feed(html[start : start + chunk_size]):
+            break
+    scanner.close()
+    return scanner
+
+
+@pytest.mark.parametrize("top", HeadScanner.PRIORITY)
+def test_priority_order(top):
+    kinds = HeadScanner.PRIORITY[HeadScanner.PRIORITY.index(top) :]
+    assert scan(page(kinds), 4096).best() == TARGETS[top]
+
+
+def test_priority_ignores_document_order():
+    # The link comes first in the body but the JS redirect still wins
+    html = (
+        f"<html><head></head><body>{HINTS['link']}{HINTS['json_ld']}"
+        f"{HINTS['js']}</body></html>"
+    ).encode()
+    assert scan(html, 64).best() == TARGETS["js"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+@pytest.mark.parametrize(
+    "kinds",
+    [
+        combo
+        for size in range(1, len(HeadScanner.PRIORITY) + 1)
+        for combo in itertools.combinations(HeadScanner.PRIORITY, size)
+    ],
+)
+def test_early_exit_never_changes_the_answer(kinds, chunk_size):
+    html = page(kinds, filler=50)
+    full = scan(html, chunk_size, FullScanner)
+    assert scan(html, chunk_size).best() == full.best()
+
+
+def test_canonical_stops_reading_early():
+    html = page(("canonical", "link"), filler=5000)
+    scanner = scan(html, 256)
+    assert scanner.best() == TARGETS["canonical"]
+    assert scanner.bytes_read < len(html)
+
+
+def test_relative_hint_is_made_absolute():
+    html = b'<html><head><link rel="canonical" href="/story"></head></html>'
+    assert scan(html, 4096).best() == "https://news.google.com/story"
+
+
+def test_links_to_redirect_domains_are_skipped():
+    html = (
+        b'<html><body><a href="https://news.google.com/other">x</a>'
+        b'<a href="https://pub.com/real">y</a></body></html>'
+    )
+    assert scan(html, 4096).best() == "https://pub.com/real"
+
+
+def test_data_p_is_collected_on_request():
+    html = b'<html><body><c-wiz data-p="%.@.1,2]"></c-wiz></body></html>'
+    scanner = HeadScanner(BASE, is_redirect_domain, want_data_p=True)
+    assert scanner.feed(html)
+    assert scanner.data_p == "%.@.1,2]"
+
+
+def test_max_bytes_stops_the_scan():
+    html = page(("link",), filler=100)
+    scanner = HeadScanner(BASE, is_redirect_domain, max_bytes=100)
+    assert not scanner.feed(html[:60])
+    assert scanner.feed(html[60:120])
+    assert scanner.feed(html[120:])
+    assert scanner.bytes_read == 120
+
+
+def test_no_hints():
+    assert scan(b"<html><body><p>nothing</p></body></html>", 16).best() is None
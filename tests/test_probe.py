@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+
+from crawl4ai_news_fetcher.redirect_resolver import RedirectResolver
+
+
+def redirect(location: str, status: int = 301) -> httpx.Response:
+    return httpx.Response(status, headers={"location": location})
+
+
+def run_probe(handler, url: str, **kwargs) -> tuple[list[str], list, RedirectResolver]:
+    requests = []
+
+    def record(request):
+        requests.append(request)
+        return handler(request)
+
+    async def main():
+        async with RedirectResolver(
+            verbose=False,
+            transport=httpx.MockTransport(record),
+            strategy=False,
+            cache=False,
+            **kwargs,
+        ) as resolver:
+            return await resolver.probe(url), resolver
+
+    hops, resolver = asyncio.run(main())
+    return hops, requests, resolver
+
+
+def test_follows_hops_with_head_until_publisher():
+    def handler(request):
+        if request.url.host == "bit.ly":
+            return redirect("https://ow.ly/2")
+        if request.url.host == "ow.ly":
+            return redirect("https://pub.com/story", status=302)
+        return httpx.Response(200)
+
+    hops, requests, _ = run_probe(handler, "https://bit.ly/1")
+    assert hops == ["https://bit.ly/1", "https://ow.ly/2", "https://pub.com/story"]
+    # The publisher itself is never contacted
+    assert [(r.method, r.url.host) for r in requests] == [
+        ("HEAD", "bit.ly"),
+        ("HEAD", "ow.ly"),
+    ]
+
+
+def test_relative_location():
+    def handler(request):
+        if request.url.path == "/1":
+            return redirect("/2")
+        return redirect("https://pub.com/story")
+
+    hops, _, _ = run_probe(handler, "https://bit.ly/1")
+    assert hops == ["https://bit.ly/1", "https://bit.ly/2", "https://pub.com/story"]
+
+
+def test_stops_on_a_loop():
+    def handler(request):
+        if request.url.path == "/a":
+            return redirect("https://dlvr.it/b")
+        return redirect("https://DLVR.it:443/a#x")
+
+    hops, requests, resolver = run_probe(handler, "https://dlvr.it/a")
+    assert hops == ["https://dlvr.it/a", "https://dlvr.it/b"]
+    assert len(requests) == 2
+    assert resolver.metrics.counter("failures", stage="Probe", reason="loop") == 1
+
+
+def test_stops_after_max_hops():
+    def handler(request):
+        n = int(request.url.path.strip("/"))
+        return redirect(f"https://bit.ly/{n + 1}")
+
+    hops, requests, _ = run_probe(handler, "https://bit.ly/0", max_hops=3)
+    assert hops == [f"https://bit.ly/{n}" for n in range(4)]
+    assert len(requests) == 3
+
+
+def test_get_fallback_when_head_is_refused():
+    for status in (403, 405, 501):
+
+        def handler(request, status=status):
+            if request.method == "HEAD":
+                return httpx.Response(status)
+            return redirect("https://pub.com/story")
+
+        hops, requests, _ = run_probe(handler, "https://bit.ly/1")
+        assert hops == ["https://bit.ly/1", "https://pub.com/story"]
+        assert [r.method for r in requests] == ["HEAD", "GET"]
+
+
+def test_non_redirect_ends_the_chain():
+    hops, requests, _ = run_probe(lambda request: httpx.Response(404), "https://t.co/x")
+    assert hops == ["https://t.co/x"]
+    assert len(requests) == 1
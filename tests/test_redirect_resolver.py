@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+
+from crawl4ai_news_fetcher.redirect_resolver import RedirectResolver
+
+
+def test_stage_chain_respects_overall_timeout():
+    async def handler(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    async def main():
+        async with RedirectResolver(
+            timeout=1.5,
+            verbose=False,
+            transport=httpx.MockTransport(handler),
+            strategy=False,
+            cache=False,
+            stage_budgets={"Probe": 1.0, "HTTP": 1.0, "Chromium": 1.0},
+        ) as resolver:
+            started = time.monotonic()
+            resolved = await resolver.resolve("https://bit.ly/slow")
+            return resolved, time.monotonic() - started, resolver.metrics
+
+    resolved, elapsed, metrics = asyncio.run(main())
+    assert resolved == "https://bit.ly/slow"
+    assert elapsed < 2.0
+    assert metrics.counter("failures", stage="Chromium", reason="deadline") == 1
+
+
+def resolve_counting(handler, url: str) -> tuple[str, int, dict]:
+    sent = []
+
+    def record(request):
+        sent.append(request)
+        return handler(request)
+
+    async def main():
+        async with RedirectResolver(
+            verbose=False,
+            transport=httpx.MockTransport(record),
+            strategy=False,
+            cache=False,
+        ) as resolver:
+            return await resolver.resolve(url), resolver.stats
+
+    resolved, stats = asyncio.run(main())
+    return resolved, len(sent), stats
+
+
+def test_every_redirect_hop_is_counted():
+    def handler(request):
+        if request.url.host == "news.google.com":
+            n = int(request.url.params.get("n", 0))
+            if n < 3:
+                return httpx.Response(
+                    302, headers={"location": f"/rss/articles/x?n={n + 1}"}
+                )
+            return httpx.Response(
+                301, headers={"location": "https://pub.com/story"}, text="moved"
+            )
+        return httpx.Response(200, html="<html></html>")
+
+    resolved, sent, stats = resolve_counting(
+        handler, "https://news.google.com/rss/articles/x"
+    )
+    assert resolved == "https://pub.com/story"
+    assert stats["requests"] == sent == 5
+    assert stats["bytes_downloaded"] >= len("moved")
+
+
+def test_redirect_loop_hops_are_counted():
+    def handler(request):
+        target = "/b" if request.url.path == "/a" else "/a"
+        return httpx.Response(301, headers={"location": target})
+
+    resolved, sent, stats = resolve_counting(handler, "https://dlvr.it/a")
+    assert resolved == "https://dlvr.it/a"
+    assert sent > 20
+    assert stats["requests"] == sent
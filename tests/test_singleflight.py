@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from crawl4ai_news_fetcher.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        return results, flight
+
+    results, flight = asyncio.run(main())
+    assert results == ["done"] * 5
+    assert calls == [1]
+    assert (flight.started, flight.coalesced, len(flight)) == (1, 4, 0)
+
+
+def test_errors_reach_every_caller():
+    async def work():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+
+    assert [type(r) for r in asyncio.run(main())] == [ValueError, ValueError]
+
+
+def test_one_cancelled_caller_leaves_the_work_running():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_work_is_cancelled_with_its_last_caller():
+    state = {}
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            state["stopped"] = True
+
+    async def main():
+        flight = SingleFlight()
+        callers = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        # The work has stopped by the time the last caller returns
+        return state.get("stopped"), len(flight)
+
+    assert asyncio.run(main()) == (True, 0)
@@ -0,0 +1,65 @@
+from crawl4ai_news_fetcher.strategy import StrategyStats
+
+STAGES = ["Probe", "HTTP", "Chromium"]
+
+
+def resolve(strategy: StrategyStats, host: str, works: dict[str, float]) -> list[str]:
+    """Run the chain for one link; ``works`` maps succeeding stages to latency."""
+    tried = []
+    for stage in strategy.order(host, STAGES):
+        tried.append(stage)
+        success = stage in works
+        strategy.record(host, stage, success, works.get(stage, 0.01))
+        if success:
+            break
+    return tried
+
+
+def test_unknown_host_keeps_default_order():
+    assert StrategyStats(explore=0).order("bit.ly", STAGES) == STAGES
+
+
+def test_one_browser_only_link_does_not_demote_cheap_stages():
+    strategy = StrategyStats(explore=0)
+    assert resolve(strategy, "bit.ly", {"Chromium": 2.0}) == STAGES
+
+    first = [resolve(strategy, "bit.ly", {"Probe": 0.01})[0] for _ in range(50)]
+    assert first == ["Probe"] * 50
+    assert strategy.order("bit.ly", STAGES) == STAGES
+
+
+def test_reliable_stage_moves_ahead_of_a_slightly_cheaper_one():
+    strategy = StrategyStats(explore=0, min_samples=100)
+    for i in range(20):
+        strategy.record("t.co", "Probe", i % 10 == 0, 0.3)
+        strategy.record("t.co", "HTTP", True, 0.5)
+    assert strategy.order("t.co", STAGES) == ["HTTP", "Probe", "Chromium"]
+
+
+def test_stages_that_never_work_are_skipped():
+    strategy = StrategyStats(explore=0, min_samples=5)
+    for _ in range(20):
+        resolve(strategy, "dlvr.it", {"Chromium": 3.0})
+    assert strategy.order("dlvr.it", STAGES) == ["Chromium"]
+    assert strategy.stats["skipped"] > 0
+
+
+def test_all_failing_falls_back_to_default_order():
+    strategy = StrategyStats(explore=0, min_samples=2)
+    for _ in range(5):
+        resolve(strategy, "ow.ly", {})
+    assert strategy.order("ow.ly", STAGES) == STAGES
+
+
+def test_custom_stage_costs():
+    strategy = StrategyStats(explore=0, stage_costs={"Probe": 10.0})
+    strategy.record("bit.ly", "HTTP", False, 0.5)
+    assert strategy.order("bit.ly", STAGES)[0] == "HTTP"
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "strategy.json")
+    strategy = StrategyStats(path, explore=0)
+    resolve(strategy, "dlvr.it", {"HTTP": 0.2})
+    strategy.save()
+    assert StrategyStats(path).snapshot("dlvr.it") == strategy.snapshot("dlvr.it")
@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from crawl4ai_news_fetcher.redirect_resolver import RedirectResolver
+from crawl4ai_news_fetcher.urls import RedirectRegistry, normalize_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://t.co/abc",
+        "https://www.t.co/abc",
+        "https://T.CO./abc",
+        "http://bit.ly/x",
+        "https://news.google.com/rss/articles/CBMi",
+        "https://a.b.dlvr.it/x",
+    ],
+)
+def test_redirect_domains_match_whole_labels(url):
+    assert RedirectRegistry().is_redirect_url(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        # Suffix of a label, not a label of its own
+        "https://microsoft.com/en-us",
+        "https://reddit.co/x",
+        "https://notbit.ly/x",
+        "https://google.com/search",
+        "https://bit.ly.evil.com/x",
+    ],
+)
+def test_lookalike_hosts_do_not_match(url):
+    assert not RedirectRegistry().is_redirect_url(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://[::1]/a",
+        "http://[2001:db8::1]:8080/a",
+        "https://[::1/a",  # unbalanced bracket: urlsplit raises
+        "not a url",
+        "",
+        "mailto:someone@t.co",
+    ],
+)
+def test_ipv6_and_invalid_hosts(url):
+    assert not RedirectRegistry().is_redirect_url(url)
+
+
+def test_custom_domains():
+    registry = RedirectRegistry(domains=["Example.ORG."], patterns=[])
+    assert registry.is_redirect_url("https://go.example.org/1")
+    assert not registry.is_redirect_url("https://t.co/1")
+    registry.add_domain("t.co")
+    registry.remove_domain("example.org")
+    assert registry.is_redirect_url("https://t.co/1")
+    assert not registry.is_redirect_url("https://go.example.org/1")
+    assert registry.domains == frozenset({"t.co"})
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://pub.com/rss/articles/1", True),
+        ("https://pub.com/amp/story", True),
+        ("https://www.google.com/url?q=https://pub.com", True),
+        ("https://pub.com/a?UTM_source=feed", True),
+        ("https://pub.com/2024/story.html", False),
+        ("https://pub.com/ramp/story", False),
+    ],
+)
+def test_patterns(url, expected):
+    assert RedirectRegistry().matches_pattern(url) is expected
+
+
+def test_patterns_are_recompiled_on_add():
+    registry = RedirectRegistry(patterns=[])
+    assert not registry.matches_pattern("https://pub.com/out?to=1")
+    registry.add_pattern(r"/out\?to=")
+    assert registry.matches_pattern("https://pub.com/out?to=1")
+
+
+def test_needs_resolution():
+    registry = RedirectRegistry()
+    assert registry.needs_resolution("https://t.co/abc")
+    assert registry.needs_resolution("https://pub.com/a?utm_medium=rss")
+    assert not registry.needs_resolution("https://www.microsoft.com/story")
+
+
+def test_direct_urls_skip_resolution():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    async def main():
+        async with RedirectResolver(
+            verbose=False, transport=httpx.MockTransport(handler), strategy=False
+        ) as resolver:
+            url = "https://www.microsoft.com/en-us/story"
+            assert not resolver._needs_redirect_resolution(url)
+            assert await resolver.resolve(url) == url
+            return resolver.metrics.counter("resolutions", method="direct")
+
+    assert asyncio.run(main()) == 1
+    assert requests == []
+
+
+def test_normalize_url():
+    assert (
+        normalize_url("HTTPS://Pub.COM:443/a?b=1#frag")
+        == normalize_url("https://pub.com/a?b=1")
+    )
+    assert normalize_url("http://pub.com") == normalize_url("http://pub.com:80/")